@@ -3,30 +3,64 @@ Crypto Trading Bot - Backend Application
 Main Flask application file
 """
 import os
-from flask import Flask, jsonify
+import asyncio
+import threading
+import weakref
+from functools import wraps
+from flask import Flask, jsonify, request
 from flask_cors import CORS
-from dotenv import load_dotenv
+from config import get_config, load_env
 from routes import api, auth
+from utils.json_provider import OrjsonProvider
 from services.api_service import ApiService
 from services.market_analyzer import MarketAnalyzer
 from services.strategy_manager import StrategyManager
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (no-op if config already parsed .env)
+load_env()
+
+class _ThreadLoop:
+    """Event loop owned by one worker thread, closed once the thread is gone"""
+    
+    __slots__ = ("loop", "__weakref__")
+    
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        # The thread-local holding this object is cleared when its thread exits
+        weakref.finalize(self, self.loop.close)
+
+class TradingBotFlask(Flask):
+    """Flask application that runs async views on a reusable per-thread event loop"""
+    
+    # Event loop for each worker thread, created on first use
+    _thread_loops = threading.local()
+    
+    def async_to_sync(self, func):
+        """
+        Wrap an async view so it runs on the current worker thread's event loop.
+        Flask's default spins up a new loop (via asgiref) for every request.
+        """
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            owner = getattr(self._thread_loops, "owner", None)
+            if owner is None or owner.loop.is_closed():
+                owner = self._thread_loops.owner = _ThreadLoop()
+            return owner.loop.run_until_complete(func(*args, **kwargs))
+        
+        return wrapper
 
 def create_app(test_config=None):
     """Create and configure the Flask application"""
-    app = Flask(__name__, static_folder="../frontend", static_url_path="/")
+    app = TradingBotFlask(__name__, static_folder="../frontend", static_url_path="/")
+    
+    # Serialize JSON responses with orjson
+    app.json = OrjsonProvider(app)
     
     # Enable CORS for all routes
     CORS(app)
     
-    # Set configuration from environment variables or defaults
-    app.config.from_mapping(
-        SECRET_KEY=os.environ.get("SECRET_KEY", "dev_key_change_in_production"),
-        DATABASE_URL=os.environ.get("DATABASE_URL", "sqlite:///crypto_bot.db"),
-        SIMULATION_MODE=(os.environ.get("SIMULATION_MODE", "true").lower() == "true")
-    )
+    # Set configuration from the environment-specific config class
+    app.config.from_object(get_config())
     
     if test_config:
         # Override configuration with test config if provided
@@ -34,18 +68,17 @@ def create_app(test_config=None):
     
     # Initialize services
     api_service = ApiService()
-    market_analyzer = MarketAnalyzer()
+    market_analyzer = MarketAnalyzer(api_service)
     strategy_manager = StrategyManager(api_service, market_analyzer)
     
     # Register blueprints for routes
     app.register_blueprint(api.bp)
     app.register_blueprint(auth.bp)
     
-    # Register services with app context
-    with app.app_context():
-        app.api_service = api_service
-        app.market_analyzer = market_analyzer
-        app.strategy_manager = strategy_manager
+    # Attach services to the app (plain attributes, no app context needed)
+    app.api_service = api_service
+    app.market_analyzer = market_analyzer
+    app.strategy_manager = strategy_manager
     
     # Basic health check route
     @app.route("/health")
@@ -63,7 +96,8 @@ def create_app(test_config=None):
     @app.errorhandler(404)
     def not_found(e):
         """Handle 404 not found errors"""
-        if request.path.startswith("/api/"):
+        path = request.path
+        if path[:5] == "/api/":
             return jsonify({"error": "Resource not found"}), 404
         return app.send_static_file("index.html")
     
@@ -77,7 +111,6 @@ def create_app(test_config=None):
 
 if __name__ == "__main__":
     # Run app when script is executed directly
-    from flask import request  # Import here to avoid circular import
     app = create_app()
     port = int(os.environ.get("PORT", 5000))
     debug = os.environ.get("FLASK_ENV", "production") == "development"
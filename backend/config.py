@@ -2,10 +2,17 @@
 Configuration settings for Crypto Trading Bot
 """
 import os
+import functools
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+@functools.lru_cache(maxsize=1)
+def load_env():
+    """Load environment variables from .env file (only parsed once per process)"""
+    load_dotenv()
+    return True
+
+# Config classes read os.environ at import time, so load .env first
+load_env()
 
 class Config:
     """Base configuration"""
@@ -43,8 +50,20 @@ class Config:
     MAX_CONCURRENT_TRADES = int(os.environ.get('MAX_CONCURRENT_TRADES', '5'))
     EMERGENCY_STOP_THRESHOLD = float(os.environ.get('EMERGENCY_STOP_THRESHOLD', '15'))
     
+    # Password hashing cost factor (bcrypt log2 rounds)
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+    
+    # Password hashing for auth routes (werkzeug method and pbkdf2 iterations)
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+    PASSWORD_HASH_ROUNDS = int(os.environ.get('PASSWORD_HASH_ROUNDS', '600000'))
+    
     # API key encryption key
     API_KEY_ENCRYPTION_KEY = os.environ.get('API_KEY_ENCRYPTION_KEY')
+    
+    @classmethod
+    def validate(cls):
+        """Validate configuration before it is used"""
+        pass
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -56,15 +75,22 @@ class TestingConfig(Config):
     TESTING = True
     DEBUG = True
     LOG_LEVEL = 'DEBUG'
+    
+    # Cheap password hashing so test suites don't spend seconds per login
+    BCRYPT_ROUNDS = 4
+    PASSWORD_HASH_ROUNDS = 1000
 
 class ProductionConfig(Config):
     """Production configuration"""
-    # In production, ensure all these are set via environment variables
-    if not os.environ.get('SECRET_KEY'):
-        raise ValueError("SECRET_KEY environment variable must be set in production")
     
-    if not os.environ.get('API_KEY_ENCRYPTION_KEY'):
-        raise ValueError("API_KEY_ENCRYPTION_KEY environment variable must be set in production")
+    @classmethod
+    def validate(cls):
+        """In production, ensure all these are set via environment variables"""
+        if not os.environ.get('SECRET_KEY'):
+            raise ValueError("SECRET_KEY environment variable must be set in production")
+        
+        if not os.environ.get('API_KEY_ENCRYPTION_KEY'):
+            raise ValueError("API_KEY_ENCRYPTION_KEY environment variable must be set in production")
 
 # Configuration dictionary
 config = {
@@ -74,8 +100,14 @@ config = {
     'default': DevelopmentConfig
 }
 
+@functools.lru_cache(maxsize=None)
+def _get_config_for_env(env):
+    """Resolve and validate the configuration class for an environment (memoized)"""
+    config_class = config.get(env, config['default'])
+    config_class.validate()
+    return config_class
+
 # Get config based on environment
 def get_config():
     """Get the appropriate configuration based on environment"""
-    env = os.environ.get('FLASK_ENV', 'development')
-    return config.get(env, config['default'])
+    return _get_config_for_env(os.environ.get('FLASK_ENV', 'development'))
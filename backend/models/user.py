@@ -2,12 +2,52 @@
 User model for the Crypto Trading Bot
 Handles user authentication, preferences, and trading settings
 """
-import uuid
-from datetime import datetime, timedelta
+import secrets
+import json
+import time
+import functools
+from datetime import datetime
 import hashlib
-import jwt
+import hmac
+import bcrypt
+from jwt.algorithms import HMACAlgorithm
+from jwt.utils import base64url_encode, base64url_decode
 from cryptography.fernet import Fernet
 import os
+from flask import current_app, has_app_context
+from config import Config
+
+# Prefix marking password hashes created by the old unsalted SHA-256 scheme
+LEGACY_SHA256_PREFIX = "sha256$"
+
+def _bcrypt_rounds():
+    """Get the bcrypt cost factor from the active app config (Config outside an app context)"""
+    if has_app_context():
+        return current_app.config.get('BCRYPT_ROUNDS', Config.BCRYPT_ROUNDS)
+    return Config.BCRYPT_ROUNDS
+
+@functools.lru_cache(maxsize=1)
+def _get_cipher():
+    """Get the Fernet cipher for API key encryption (created once per process)"""
+    # Get encryption key from environment (in production, use a more secure method)
+    key = os.environ.get('API_KEY_ENCRYPTION_KEY', 'fallback_dev_key_not_for_production').encode()
+    return Fernet(key)
+
+# HS256 algorithm and pre-encoded JOSE header shared by all auth tokens
+_HS256 = HMACAlgorithm(HMACAlgorithm.SHA256)
+_JWT_HEADER_SEGMENT = base64url_encode(
+    json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode()
+)
+
+@functools.lru_cache(maxsize=1)
+def _get_secret_key():
+    """Get the secret key used to sign auth tokens (read once per process)"""
+    return os.environ.get('SECRET_KEY', 'dev_key_change_in_production')
+
+@functools.lru_cache(maxsize=1)
+def _get_signing_key():
+    """Get the prepared HMAC key for auth tokens (parsed once per process)"""
+    return _HS256.prepare_key(_get_secret_key())
 
 class User:
     """User model representing a crypto trading bot user"""
@@ -22,7 +62,7 @@ class User:
             password_hash (str, optional): Hashed password. Defaults to None.
             user_id (str, optional): User ID. Defaults to None (generates a new UUID).
         """
-        self.user_id = user_id or str(uuid.uuid4())
+        self.user_id = user_id or secrets.token_urlsafe(12)
         self.username = username
         self.email = email
         self.password_hash = password_hash
@@ -37,6 +77,27 @@ class User:
         self.watchlist = []  # list of cryptocurrency symbols
         self.api_keys = {}  # encrypted API keys for exchanges
         self.strategies = []  # enabled trading strategy IDs
+    
+    @property
+    def created_at(self):
+        """datetime: When the user was created"""
+        return self._created_at
+    
+    @created_at.setter
+    def created_at(self, value):
+        self._created_at = value
+        # Cache the ISO string so serialization doesn't re-format it
+        self._created_at_iso = value.isoformat()
+    
+    @property
+    def last_login(self):
+        """datetime: When the user last logged in, or None"""
+        return self._last_login
+    
+    @last_login.setter
+    def last_login(self, value):
+        self._last_login = value
+        self._last_login_iso = value.isoformat() if value else None
         
     def set_password(self, password):
         """
@@ -45,12 +106,14 @@ class User:
         Args:
             password (str): Plain text password
         """
-        # Use SHA-256 for hashing (in production, use a more secure method like bcrypt)
-        self.password_hash = hashlib.sha256(password.encode()).hexdigest()
+        # Cost factor comes from the configuration so it can be raised over time
+        rounds = _bcrypt_rounds()
+        self.password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=rounds)).decode('ascii')
     
     def verify_password(self, password):
         """
-        Verify if the provided password matches the stored hash
+        Verify if the provided password matches the stored hash.
+        Legacy SHA-256 hashes are upgraded to bcrypt on a successful match.
         
         Args:
             password (str): Plain text password to verify
@@ -58,8 +121,20 @@ class User:
         Returns:
             bool: True if password matches, False otherwise
         """
-        hashed = hashlib.sha256(password.encode()).hexdigest()
-        return hashed == self.password_hash
+        if not self.password_hash:
+            return False
+        
+        if self.password_hash.startswith(LEGACY_SHA256_PREFIX):
+            legacy_hash = self.password_hash[len(LEGACY_SHA256_PREFIX):]
+            hashed = hashlib.sha256(password.encode()).hexdigest()
+            if not hmac.compare_digest(hashed, legacy_hash):
+                return False
+            
+            # Re-hash with bcrypt now that we know the plain text password
+            self.set_password(password)
+            return True
+        
+        return bcrypt.checkpw(password.encode(), self.password_hash.encode('ascii'))
     
     def add_api_key(self, exchange, api_key, api_secret):
         """
@@ -74,11 +149,7 @@ class User:
             bool: Success status
         """
         try:
-            # Get encryption key from environment (in production, use a more secure method)
-            key = os.environ.get('API_KEY_ENCRYPTION_KEY', 'fallback_dev_key_not_for_production').encode()
-            
-            # Create cipher for encryption
-            cipher = Fernet(key)
+            cipher = _get_cipher()
             
             # Encrypt API credentials
             encrypted_key = cipher.encrypt(api_key.encode()).decode()
@@ -109,11 +180,7 @@ class User:
             return None
         
         try:
-            # Get encryption key from environment
-            key = os.environ.get('API_KEY_ENCRYPTION_KEY', 'fallback_dev_key_not_for_production').encode()
-            
-            # Create cipher for decryption
-            cipher = Fernet(key)
+            cipher = _get_cipher()
             
             # Decrypt API credentials
             encrypted_key = self.api_keys[exchange]['key']
@@ -140,16 +207,19 @@ class User:
         Returns:
             str: JWT token
         """
-        # Get secret key from environment
-        secret_key = os.environ.get('SECRET_KEY', 'dev_key_change_in_production')
-        
         payload = {
             'user_id': self.user_id,
             'username': self.username,
-            'exp': datetime.utcnow() + timedelta(hours=expiration)
+            'exp': int(time.time()) + expiration * 3600
         }
         
-        return jwt.encode(payload, secret_key, algorithm='HS256')
+        # Sign directly with the cached key instead of re-deriving it via jwt.encode
+        signing_input = _JWT_HEADER_SEGMENT + b"." + base64url_encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        )
+        signature = _HS256.sign(signing_input, _get_signing_key())
+        
+        return (signing_input + b"." + base64url_encode(signature)).decode()
     
     @staticmethod
     def verify_auth_token(token):
@@ -162,17 +232,32 @@ class User:
         Returns:
             dict: Token payload if valid, None otherwise
         """
-        secret_key = os.environ.get('SECRET_KEY', 'dev_key_change_in_production')
-        
         try:
-            payload = jwt.decode(token, secret_key, algorithms=['HS256'])
-            return payload
-        except jwt.ExpiredSignatureError:
-            # Token has expired
+            signing_input, _, signature = token.encode().rpartition(b".")
+            header_segment, _, payload_segment = signing_input.partition(b".")
+            
+            # Only accept the exact HS256 header we issue
+            if header_segment != _JWT_HEADER_SEGMENT:
+                return None
+            
+            if not _HS256.verify(signing_input, _get_signing_key(), base64url_decode(signature)):
+                # Invalid token
+                return None
+            
+            payload = json.loads(base64url_decode(payload_segment))
+        except (AttributeError, ValueError):
+            # Malformed token
+            return None
+        
+        if not isinstance(payload, dict):
             return None
-        except jwt.InvalidTokenError:
-            # Invalid token
+        
+        exp = payload.get('exp')
+        if not isinstance(exp, (int, float)) or exp <= time.time():
+            # Token has expired
             return None
+        
+        return payload
     
     def to_dict(self, include_private=False):
         """
@@ -188,8 +273,8 @@ class User:
             'user_id': self.user_id,
             'username': self.username,
             'email': self.email,
-            'created_at': self.created_at.isoformat(),
-            'last_login': self.last_login.isoformat() if self.last_login else None,
+            'created_at': self._created_at_iso,
+            'last_login': self._last_login_iso,
             'is_active': self.is_active,
             'risk_level': self.risk_level,
             'max_position_size': self.max_position_size,
@@ -215,10 +300,16 @@ class User:
         Returns:
             User: User object
         """
+        password_hash = data.get('password_hash')
+        
+        # Bare 64-char hex digests were stored by the old SHA-256 scheme
+        if password_hash and len(password_hash) == 64 and not password_hash.startswith('$'):
+            password_hash = LEGACY_SHA256_PREFIX + password_hash
+        
         user = cls(
             username=data['username'],
             email=data['email'],
-            password_hash=data.get('password_hash'),
+            password_hash=password_hash,
             user_id=data.get('user_id')
         )
         
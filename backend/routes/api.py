@@ -2,17 +2,47 @@
 API routes for Crypto Trading Bot
 """
 import os
+import numpy as np
+from datetime import datetime
 from flask import Blueprint, request, jsonify, current_app, g
+from utils.json_provider import orjson_response
+from utils.helpers import with_iso_timestamp
+from routes.validation import (
+    validate_body,
+    ActivateStrategyRequest,
+    DeactivateStrategyRequest,
+    RiskSettingsRequest,
+    ExecuteTradeRequest,
+    SignalsBatchRequest,
+    BacktestRequest,
+    BacktestSweepRequest,
+    ExchangeConfigRequest,
+    ActiveExchangeRequest
+)
 
 bp = Blueprint("api", __name__, url_prefix="/api")
 
+# Hour offsets (oldest first) for the dummy portfolio history
+PORTFOLIO_HISTORY_OFFSETS = np.arange(100, 0, -1).astype("timedelta64[h]")
+
+# Dummy asset allocation as (symbol, name, weight)
+PORTFOLIO_ASSET_WEIGHTS = (
+    ("BTC", "Bitcoin", 0.4),
+    ("ETH", "Ethereum", 0.3),
+    ("USDT", "Tether", 0.2),
+    ("SOL", "Solana", 0.1)
+)
+
+# Random generator for dummy data
+_rng = np.random.default_rng()
+
 @bp.route("/markets", methods=["GET"])
 def get_markets():
     """Get top cryptocurrency markets"""
     try:
         limit = int(request.args.get("limit", 100))
         markets = current_app.api_service.get_top_markets(limit)
-        return jsonify(markets)
+        return orjson_response(markets, etag=True)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -22,7 +52,7 @@ def get_historical_data(coin_id):
     try:
         days = request.args.get("days", "30")
         data = current_app.api_service.get_historical_data(coin_id, days)
-        return jsonify(data)
+        return orjson_response(data, etag=True)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -47,6 +77,19 @@ def get_correlations(base_coin):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@bp.route("/market/analyze", methods=["GET"])
+def analyze_markets():
+    """Analyze market conditions for a comma-separated list of symbols"""
+    try:
+        symbols = [symbol for symbol in request.args.get("symbols", "").split(",") if symbol]
+        if not symbols:
+            return jsonify({"error": "No symbols provided"}), 400
+        
+        analysis = current_app.market_analyzer.analyze_markets_batch(symbols)
+        return jsonify(analysis)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @bp.route("/market/analyze/<string:symbol>", methods=["GET"])
 def analyze_market(symbol):
     """Analyze market conditions and detect regime"""
@@ -75,24 +118,16 @@ async def get_optimal_strategy(symbol):
         return jsonify({"error": str(e)}), 500
 
 @bp.route("/strategy/activate", methods=["POST"])
+@validate_body(ActivateStrategyRequest)
 def activate_strategy():
     """Create and activate a strategy"""
     try:
-        data = request.json
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
-        
-        # Validate required fields
-        required_fields = ["name", "type", "parameters", "symbols"]
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-        
+        body = g.body
         success = current_app.strategy_manager.activate_strategy(
-            data["name"],
-            data["type"],
-            data["parameters"],
-            data["symbols"]
+            body.name,
+            body.type,
+            body.parameters,
+            body.symbols
         )
         
         if success:
@@ -103,22 +138,14 @@ def activate_strategy():
         return jsonify({"error": str(e)}), 500
 
 @bp.route("/strategy/deactivate", methods=["POST"])
+@validate_body(DeactivateStrategyRequest)
 def deactivate_strategy():
     """Deactivate a strategy for specific symbols"""
     try:
-        data = request.json
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
-        
-        # Validate required fields
-        required_fields = ["type", "symbols"]
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-        
+        body = g.body
         success = current_app.strategy_manager.deactivate_strategy(
-            data["type"],
-            data["symbols"]
+            body.type,
+            body.symbols
         )
         
         if success:
@@ -141,14 +168,11 @@ def get_strategy_performance(type_str, symbol):
         return jsonify({"error": str(e)}), 500
 
 @bp.route("/strategy/risk", methods=["POST"])
+@validate_body(RiskSettingsRequest)
 def update_risk_settings():
     """Update risk management settings"""
     try:
-        data = request.json
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
-        
-        current_app.strategy_manager.update_risk_settings(data)
+        current_app.strategy_manager.update_risk_settings(g.body.model_dump(exclude_unset=True))
         return jsonify({"success": True, "message": "Risk settings updated"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -168,25 +192,28 @@ async def get_trade_signal(symbol):
         
         signal = await current_app.strategy_manager.get_signal(symbol, price)
         if signal:
-            return jsonify(signal)
+            return jsonify(with_iso_timestamp(signal))
         else:
             return jsonify({"message": "No signal at this time"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@bp.route("/trade/signals", methods=["POST"])
+@validate_body(SignalsBatchRequest)
+async def get_trade_signals():
+    """Get trading signals for several symbols at given prices"""
+    try:
+        signals = await current_app.strategy_manager.get_signals_batch(g.body.prices)
+        return jsonify({symbol: with_iso_timestamp(signal) for symbol, signal in signals.items()})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @bp.route("/trade/execute", methods=["POST"])
+@validate_body(ExecuteTradeRequest)
 async def execute_trade():
     """Execute a trade"""
     try:
-        data = request.json
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
-        
-        # Validate required fields
-        required_fields = ["symbol", "action", "quantity"]
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
+        data = g.body.model_dump(exclude_unset=True)
         
         # Check if we're in simulation mode
         simulation = current_app.config.get("SIMULATION_MODE", True)
@@ -195,31 +222,42 @@ async def execute_trade():
         
         # Execute the trade
         result = await current_app.strategy_manager.execute_signal(data, simulation)
-        return jsonify(result)
+        return jsonify(with_iso_timestamp(result))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @bp.route("/backtest", methods=["POST"])
+@validate_body(BacktestRequest)
 async def run_backtest():
     """Run a backtest"""
     try:
-        data = request.json
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
-        
-        # Validate required fields
-        required_fields = ["type", "parameters", "symbol", "start_date", "end_date", "initial_capital"]
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-        
+        body = g.body
         result = await current_app.strategy_manager.backtest(
-            data["type"],
-            data["parameters"],
-            data["symbol"],
-            data["start_date"],
-            data["end_date"],
-            data["initial_capital"]
+            body.type,
+            body.parameters,
+            body.symbol,
+            body.start_date,
+            body.end_date,
+            body.initial_capital
+        )
+        
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route("/backtest/sweep", methods=["POST"])
+@validate_body(BacktestSweepRequest)
+async def run_backtest_sweep():
+    """Run backtests for several parameter sets of a strategy"""
+    try:
+        body = g.body
+        result = await current_app.strategy_manager.backtest_sweep(
+            body.type,
+            body.parameter_sets,
+            body.symbol,
+            body.start_date,
+            body.end_date,
+            body.initial_capital
         )
         
         return jsonify(result)
@@ -232,25 +270,20 @@ def get_portfolio():
     try:
         # In a real system, this would fetch data from a database
         # For now, we'll just return dummy data
-        import random
-        from datetime import datetime, timedelta
-        
-        # Generate portfolio history
-        history = []
-        value = 10000
-        now = datetime.now()
+        # Generate portfolio history (±1% change per hour, compounded)
+        values = 10000 * np.cumprod(1 + (_rng.random(len(PORTFOLIO_HISTORY_OFFSETS)) * 0.02 - 0.01))
+        times = np.datetime_as_string(np.datetime64(datetime.now(), "us") - PORTFOLIO_HISTORY_OFFSETS, unit="us")
         
-        for i in range(100):
-            time = (now - timedelta(hours=100-i)).isoformat()
-            value = value * (1 + (random.random() * 0.02 - 0.01))  # ±1% change
-            history.append({"time": time, "value": value})
+        history = [
+            {"time": time, "value": value}
+            for time, value in zip(times.tolist(), values.tolist())
+        ]
+        value = history[-1]["value"]
         
         # Generate asset allocation
         assets = [
-            {"symbol": "BTC", "name": "Bitcoin", "percentage": 40, "value": value * 0.4},
-            {"symbol": "ETH", "name": "Ethereum", "percentage": 30, "value": value * 0.3},
-            {"symbol": "USDT", "name": "Tether", "percentage": 20, "value": value * 0.2},
-            {"symbol": "SOL", "name": "Solana", "percentage": 10, "value": value * 0.1}
+            {"symbol": symbol, "name": name, "percentage": round(weight * 100), "value": value * weight}
+            for symbol, name, weight in PORTFOLIO_ASSET_WEIGHTS
         ]
         
         return jsonify({
@@ -266,34 +299,26 @@ def get_trades():
     """Get trade history"""
     try:
         # Get trades from strategy manager
-        trades = current_app.strategy_manager.trades
-        return jsonify(trades)
+        trades = current_app.strategy_manager.get_trades()
+        return jsonify([with_iso_timestamp(trade) for trade in trades])
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @bp.route("/exchange/config", methods=["POST"])
+@validate_body(ExchangeConfigRequest)
 def configure_exchange():
     """Configure exchange API keys"""
     try:
-        data = request.json
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
-        
-        # Validate required fields
-        required_fields = ["exchange", "api_key", "api_secret"]
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-        
+        body = g.body
         success = current_app.api_service.set_exchange_keys(
-            data["exchange"],
-            data["api_key"],
-            data["api_secret"]
+            body.exchange,
+            body.api_key,
+            body.api_secret
         )
         
         if success:
             # Set as active exchange
-            current_app.api_service.set_active_exchange(data["exchange"])
+            current_app.api_service.set_active_exchange(body.exchange)
             return jsonify({"success": True, "message": "Exchange configured"})
         else:
             return jsonify({"success": False, "message": "Failed to configure exchange"}), 500
@@ -310,16 +335,14 @@ def get_active_exchange():
         return jsonify({"error": str(e)}), 500
 
 @bp.route("/exchange/active", methods=["POST"])
+@validate_body(ActiveExchangeRequest, error_message="Exchange not specified")
 def set_active_exchange():
     """Set active exchange"""
     try:
-        data = request.json
-        if not data or "exchange" not in data:
-            return jsonify({"error": "Exchange not specified"}), 400
-        
-        success = current_app.api_service.set_active_exchange(data["exchange"])
+        exchange = g.body.exchange
+        success = current_app.api_service.set_active_exchange(exchange)
         if success:
-            return jsonify({"success": True, "message": f"Active exchange set to {data['exchange']}"})
+            return jsonify({"success": True, "message": f"Active exchange set to {exchange}"})
         else:
             return jsonify({"success": False, "message": "Failed to set active exchange"}), 500
     except Exception as e:
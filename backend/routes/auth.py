@@ -3,21 +3,106 @@ Authentication routes for Crypto Trading Bot
 """
 import os
 import jwt
-import uuid
+import time
+import hashlib
 import logging
-from functools import wraps
+import threading
+import secrets
+from functools import wraps, lru_cache
+from cachetools import TTLCache
 from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify, current_app, g
 from werkzeug.security import generate_password_hash, check_password_hash
+from utils.json_provider import orjson_response
 
 bp = Blueprint("auth", __name__, url_prefix="/auth")
 
 # In-memory user database for simplicity
 # In a production environment, use a proper database
-users = {}
+# Stored column-wise: one dict per field, each keyed by user_id
+usernames = {}
+emails = {}
+password_hashes = {}
+created_at = {}
+
+# Indexes mapping username / email to user_id for O(1) lookups
+users_by_username = {}
+users_by_email = {}
 
 logger = logging.getLogger(__name__)
 
+# Verified JWT payloads keyed by token digest, stored as (payload, user_id, exp).
+# Only successfully decoded tokens are cached, so invalid ones are always re-checked.
+_token_cache = TTLCache(maxsize=10000, ttl=30)
+_token_cache_lock = threading.Lock()
+
+# Token cache keys per user_id, used to drop a user's entries when their profile changes
+_token_keys_by_user = {}
+
+def _token_cache_key(token):
+    """Get the cache key for a bearer token"""
+    return hashlib.sha256(token.encode()).digest()[:16]
+
+def _get_cached_token_payload(token):
+    """
+    Get the verified payload and user_id for a token from the cache
+    
+    Returns:
+        (payload, user_id) tuple, or None on a miss or if the token has since expired
+    """
+    with _token_cache_lock:
+        entry = _token_cache.get(_token_cache_key(token))
+    
+    if entry is None or time.time() >= entry[2]:
+        return None
+    
+    return entry[0], entry[1]
+
+def _cache_token_payload(token, payload, user_id):
+    """Cache a verified token payload for an existing user until the cache TTL or token expiry"""
+    exp = payload.get('exp')
+    if exp is None:
+        return
+    
+    key = _token_cache_key(token)
+    with _token_cache_lock:
+        _token_cache[key] = (payload, user_id, exp)
+        
+        # Forget keys the TTL cache has already evicted so the index stays bounded
+        keys = {k for k in _token_keys_by_user.get(user_id, ()) if k in _token_cache}
+        keys.add(key)
+        _token_keys_by_user[user_id] = keys
+
+def _invalidate_user_tokens(user_id):
+    """Drop all cached token entries for a user"""
+    with _token_cache_lock:
+        for key in _token_keys_by_user.pop(user_id, ()):
+            _token_cache.pop(key, None)
+
+def _hash_password(password):
+    """
+    Hash a password with the configured method and cost
+    
+    Args:
+        password: Plain text password
+        
+    Returns:
+        Password hash string
+    """
+    method = current_app.config.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+    rounds = current_app.config.get('PASSWORD_HASH_ROUNDS')
+    
+    # Only pbkdf2 takes an iteration count as the last method segment
+    if method.startswith('pbkdf2') and rounds:
+        method = f"{method}:{rounds}"
+    
+    return generate_password_hash(password, method=method)
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash():
+    """Hash checked for unknown usernames so login timing doesn't reveal which users exist"""
+    return _hash_password(secrets.token_urlsafe(16))
+
 def token_required(f):
     """
     JWT token authentication decorator
@@ -34,21 +119,30 @@ def token_required(f):
         if not token:
             return jsonify({'error': 'Token is missing'}), 401
         
-        try:
-            # Decode token
-            secret_key = current_app.config['SECRET_KEY']
-            data = jwt.decode(token, secret_key, algorithms=['HS256'])
+        cached = _get_cached_token_payload(token)
+        
+        if cached is None:
+            try:
+                # Decode token
+                secret_key = current_app.config['SECRET_KEY']
+                data = jwt.decode(token, secret_key, algorithms=['HS256'])
             
-            # Set current user in flask g object
-            g.current_user = users.get(data['user_id'])
+            except jwt.ExpiredSignatureError:
+                return jsonify({'error': 'Token has expired'}), 401
+            except jwt.InvalidTokenError:
+                return jsonify({'error': 'Invalid token'}), 401
             
-            if not g.current_user:
+            user_id = data['user_id']
+            
+            if user_id not in usernames:
                 return jsonify({'error': 'User not found'}), 401
+            
+            _cache_token_payload(token, data, user_id)
+        else:
+            data, user_id = cached
         
-        except jwt.ExpiredSignatureError:
-            return jsonify({'error': 'Token has expired'}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({'error': 'Invalid token'}), 401
+        # Set current user in flask g object
+        g.current_user_id = user_id
         
         return f(*args, **kwargs)
     
@@ -60,7 +154,7 @@ def register():
     Register a new user
     """
     try:
-        data = request.json
+        data = request.get_json(silent=True)
         
         if not data:
             return jsonify({'error': 'No data provided'}), 400
@@ -72,21 +166,19 @@ def register():
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
         # Check if user already exists
-        for user in users.values():
-            if user['username'] == data['username']:
-                return jsonify({'error': 'Username already taken'}), 409
-            if user['email'] == data['email']:
-                return jsonify({'error': 'Email already registered'}), 409
+        if data['username'] in users_by_username:
+            return jsonify({'error': 'Username already taken'}), 409
+        if data['email'] in users_by_email:
+            return jsonify({'error': 'Email already registered'}), 409
         
         # Create user
-        user_id = str(uuid.uuid4())
-        users[user_id] = {
-            'id': user_id,
-            'username': data['username'],
-            'email': data['email'],
-            'password': generate_password_hash(data['password']),
-            'created_at': datetime.now().isoformat()
-        }
+        user_id = secrets.token_urlsafe(12)
+        usernames[user_id] = data['username']
+        emails[user_id] = data['email']
+        password_hashes[user_id] = _hash_password(data['password'])
+        created_at[user_id] = datetime.now().isoformat()
+        users_by_username[data['username']] = user_id
+        users_by_email[data['email']] = user_id
         
         return jsonify({
             'message': 'User registered successfully',
@@ -94,7 +186,7 @@ def register():
         }), 201
     
     except Exception as e:
-        logger.error(f"Registration error: {str(e)}")
+        logger.error("Registration error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/login', methods=['POST'])
@@ -103,7 +195,7 @@ def login():
     Authenticate user and issue JWT token
     """
     try:
-        data = request.json
+        data = request.get_json(silent=True)
         
         if not data:
             return jsonify({'error': 'No data provided'}), 400
@@ -115,20 +207,17 @@ def login():
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
         # Find user by username
-        user = None
-        for u in users.values():
-            if u['username'] == data['username']:
-                user = u
-                break
-        
-        # Check user and password
-        if not user or not check_password_hash(user['password'], data['password']):
+        user_id = users_by_username.get(data['username'])
+        
+        # Check user and password (always run one constant-time hash check)
+        password_hash = password_hashes[user_id] if user_id else _dummy_password_hash()
+        if not check_password_hash(password_hash, data['password']) or not user_id:
             return jsonify({'error': 'Invalid username or password'}), 401
         
         # Generate token
         secret_key = current_app.config['SECRET_KEY']
         token = jwt.encode({
-            'user_id': user['id'],
+            'user_id': user_id,
             'exp': datetime.utcnow() + timedelta(hours=24)
         }, secret_key, algorithm='HS256')
         
@@ -136,14 +225,14 @@ def login():
             'message': 'Login successful',
             'token': token,
             'user': {
-                'id': user['id'],
-                'username': user['username'],
-                'email': user['email']
+                'id': user_id,
+                'username': usernames[user_id],
+                'email': emails[user_id]
             }
         })
     
     except Exception as e:
-        logger.error(f"Login error: {str(e)}")
+        logger.error("Login error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/profile', methods=['GET'])
@@ -153,20 +242,20 @@ def profile():
     Get user profile
     """
     try:
-        user = g.current_user
+        user_id = g.current_user_id
         
-        # Remove password from user data
+        # Build user data without the password hash
         user_data = {
-            'id': user['id'],
-            'username': user['username'],
-            'email': user['email'],
-            'created_at': user['created_at']
+            'id': user_id,
+            'username': usernames[user_id],
+            'email': emails[user_id],
+            'created_at': created_at[user_id]
         }
         
-        return jsonify(user_data)
+        return orjson_response(user_data, etag=True)
     
     except Exception as e:
-        logger.error(f"Profile error: {str(e)}")
+        logger.error("Profile error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/update', methods=['PUT'])
@@ -176,34 +265,41 @@ def update_profile():
     Update user profile
     """
     try:
-        data = request.json
+        data = request.get_json(silent=True)
         
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        user = g.current_user
+        user_id = g.current_user_id
         
-        # Update allowed fields
-        allowed_fields = ['email']
-        for field in allowed_fields:
-            if field in data:
-                user[field] = data[field]
+        # Update email, keeping the email index in sync
+        if 'email' in data and data['email'] != emails[user_id]:
+            owner_id = users_by_email.get(data['email'])
+            if owner_id and owner_id != user_id:
+                return jsonify({'error': 'Email already registered'}), 409
+            
+            users_by_email.pop(emails[user_id], None)
+            users_by_email[data['email']] = user_id
+            emails[user_id] = data['email']
         
         # Update password if provided
         if 'password' in data and data['password']:
-            user['password'] = generate_password_hash(data['password'])
+            password_hashes[user_id] = _hash_password(data['password'])
+        
+        # Make later requests pick up the changed profile
+        _invalidate_user_tokens(user_id)
         
         return jsonify({
             'message': 'Profile updated successfully',
             'user': {
-                'id': user['id'],
-                'username': user['username'],
-                'email': user['email']
+                'id': user_id,
+                'username': usernames[user_id],
+                'email': emails[user_id]
             }
         })
     
     except Exception as e:
-        logger.error(f"Update profile error: {str(e)}")
+        logger.error("Update profile error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/logout', methods=['POST'])
@@ -0,0 +1,148 @@
+"""
+Request body validation for Crypto Trading Bot routes
+Schemas are compiled once at import and applied with the validate_body decorator
+"""
+import inspect
+from functools import wraps
+from typing import Any, Dict, List, Optional
+from flask import request, jsonify, g
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, ValidationInfo, field_validator
+
+# Most parameter sets a single backtest sweep may run
+MAX_SWEEP_PARAMETER_SETS = 64
+
+# Parameters the trend strategy stores but doesn't use (its EMA periods are fixed), so sweeping them does nothing
+_FIXED_TREND_PARAMETERS = frozenset(("short_ema", "long_ema"))
+
+class ActivateStrategyRequest(BaseModel):
+    """Body for activating a strategy"""
+    name: str
+    type: str
+    parameters: Dict[str, Any]
+    symbols: List[str]
+
+class DeactivateStrategyRequest(BaseModel):
+    """Body for deactivating a strategy"""
+    type: str
+    symbols: List[str]
+
+class RiskSettingsRequest(BaseModel):
+    """Body for updating risk management settings (all fields optional)"""
+    model_config = ConfigDict(extra="allow")
+    
+    max_position_size: Optional[float] = None
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+    max_concurrent_trades: Optional[int] = None
+    emergency_stop_threshold: Optional[float] = None
+
+class ExecuteTradeRequest(BaseModel):
+    """Body for executing a trade (extra signal fields are passed through)"""
+    model_config = ConfigDict(extra="allow")
+    
+    symbol: str
+    action: str
+    quantity: float
+    simulation: Optional[bool] = None
+
+class SignalsBatchRequest(BaseModel):
+    """Body for getting signals for several symbols"""
+    prices: Dict[str, float]
+
+class BacktestRequest(BaseModel):
+    """Body for running a backtest"""
+    type: str
+    parameters: Dict[str, Any]
+    symbol: str
+    start_date: str
+    end_date: str
+    initial_capital: float
+
+class BacktestSweepRequest(BaseModel):
+    """Body for backtesting several parameter sets of a strategy"""
+    type: str
+    parameter_sets: List[Dict[str, Any]] = Field(min_length=1, max_length=MAX_SWEEP_PARAMETER_SETS)
+    symbol: str
+    start_date: str
+    end_date: str
+    initial_capital: float
+    
+    @field_validator("parameter_sets")
+    @classmethod
+    def check_trend_parameters(cls, parameter_sets: List[Dict[str, Any]], info: ValidationInfo) -> List[Dict[str, Any]]:
+        """Reject trend EMA periods, which would give identical results for every set"""
+        if info.data.get("type") == "trend" and any(_FIXED_TREND_PARAMETERS.intersection(p) for p in parameter_sets):
+            raise ValueError("short_ema and long_ema are not supported for trend sweeps (the EMA periods are fixed)")
+        return parameter_sets
+
+class ExchangeConfigRequest(BaseModel):
+    """Body for configuring exchange API keys"""
+    exchange: str
+    api_key: str
+    api_secret: str
+
+class ActiveExchangeRequest(BaseModel):
+    """Body for setting the active exchange"""
+    exchange: str
+
+def _format_validation_error(error: ValidationError) -> str:
+    """
+    Convert the first pydantic validation error to an API error message
+    
+    Args:
+        error: Validation error raised by the schema
+        
+    Returns:
+        Error message
+    """
+    first = error.errors()[0]
+    field = ".".join(str(part) for part in first["loc"])
+    
+    if first["type"] == "missing":
+        return f"Missing required field: {field}"
+    if not field:
+        return "Invalid request body"
+    return f"Invalid field {field}: {first['msg']}"
+
+def validate_body(schema, error_message=None):
+    """
+    Decorator validating the JSON request body against a schema.
+    The parsed model is stored in g.body.
+    
+    Args:
+        schema: Pydantic model class
+        error_message: Optional message replacing all validation errors
+    """
+    def parse():
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({"error": error_message or "No data provided"}), 400
+        
+        try:
+            g.body = schema.model_validate(data)
+        except ValidationError as e:
+            return jsonify({"error": error_message or _format_validation_error(e)}), 400
+        
+        return None
+    
+    def decorator(f):
+        if inspect.iscoroutinefunction(f):
+            @wraps(f)
+            async def async_decorated(*args, **kwargs):
+                error = parse()
+                if error:
+                    return error
+                return await f(*args, **kwargs)
+            
+            return async_decorated
+        
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            error = parse()
+            if error:
+                return error
+            return f(*args, **kwargs)
+        
+        return decorated
+    
+    return decorator
@@ -3,18 +3,48 @@ API Service module for Crypto Trading Bot
 Handles connections to external cryptocurrency APIs
 """
 import os
-import time
 import json
 import logging
+import threading
+import orjson
 import requests
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union, Tuple
-from requests.exceptions import RequestException
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Tuple
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException, InvalidJSONError
+from urllib3.util.retry import Retry
 from cryptography.fernet import Fernet
+from utils.cache import StaleTTLCache
 
 class ApiService:
     """Service for interacting with external cryptocurrency APIs"""
     
+    # Fixed CoinGecko query parameters (read-only, shared by all requests)
+    MARKETS_PARAMS = MappingProxyType({
+        "vs_currency": "usd",
+        "order": "market_cap_desc",
+        "page": 1,
+        "sparkline": "false",
+        "price_change_percentage": "24h"
+    })
+    COIN_DETAILS_PARAMS = MappingProxyType({
+        "localization": "false",
+        "tickers": "false",
+        "market_data": "true",
+        "community_data": "false",
+        "developer_data": "false",
+        "sparkline": "false"
+    })
+    MULTIPLE_PRICES_PARAMS = MappingProxyType({
+        "vs_currencies": "usd",
+        "include_market_cap": "true",
+        "include_24hr_vol": "true",
+        "include_24hr_change": "true"
+    })
+    
     def __init__(self):
         """Initialize the API service with base URLs and cache"""
         # Base URLs for various APIs
@@ -26,11 +56,23 @@ class ApiService:
             "coinbase": "https://api.exchange.coinbase.com"
         }
         
-        # Cache for API responses
-        self.cache = {
-            "market_data": {},
-            "historical_data": {}
-        }
+        # Precomputed CoinGecko endpoint URLs
+        self._coins_url = f"{self.api_urls['coingecko']}/coins"
+        self._markets_url = f"{self._coins_url}/markets"
+        self._simple_price_url = f"{self.api_urls['coingecko']}/simple/price"
+        
+        # Persistent HTTP session so connections (and TLS handshakes) are reused
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "crypto-trading-bot/1.0"
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount("https://", adapter)
+        
+        # Worker pool for fanning out independent API requests
+        self.pool = ThreadPoolExecutor(max_workers=8)
         
         # Cache expiration (in seconds)
         self.cache_expiration = {
@@ -38,6 +80,12 @@ class ApiService:
             "historical_data": 300  # 5 minutes
         }
         
+        # Bounded caches for API responses, keeping the last value per key as a fallback for failed requests
+        self.cache = {
+            "market_data": StaleTTLCache(maxsize=2048, ttl=self.cache_expiration["market_data"]),
+            "historical_data": StaleTTLCache(maxsize=512, ttl=self.cache_expiration["historical_data"])
+        }
+        
         # Exchange API keys - will be set by the user
         self.exchange_keys = {
             "binance": {"api_key": None, "api_secret": None, "enabled": False},
@@ -53,6 +101,13 @@ class ApiService:
         
         self.active_exchange = None
         self.logger = logging.getLogger(__name__)
+        
+        # Random generator for demonstration data
+        self._rng = np.random.default_rng()
+        
+        # In-flight requests by (url, params), so concurrent identical fetches share one call
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
     
     def _setup_encryption(self):
         """Set up encryption for API keys"""
@@ -85,12 +140,12 @@ class ApiService:
             Success status
         """
         if exchange not in self.exchange_keys:
-            self.logger.error(f"Exchange {exchange} not supported")
+            self.logger.error("Exchange %s not supported", exchange)
             return False
         
-        # Encrypt API keys
-        encrypted_key = self.cipher.encrypt(api_key.encode()).decode()
-        encrypted_secret = self.cipher.encrypt(api_secret.encode()).decode()
+        # Encrypt API keys (ciphertext is kept as bytes)
+        encrypted_key = self.cipher.encrypt(api_key.encode())
+        encrypted_secret = self.cipher.encrypt(api_secret.encode())
         
         self.exchange_keys[exchange] = {
             "api_key": encrypted_key,
@@ -124,8 +179,8 @@ class ApiService:
         if not encrypted_key or not encrypted_secret:
             return None, None
         
-        api_key = self.cipher.decrypt(encrypted_key.encode()).decode()
-        api_secret = self.cipher.decrypt(encrypted_secret.encode()).decode()
+        api_key = self.cipher.decrypt(encrypted_key).decode()
+        api_secret = self.cipher.decrypt(encrypted_secret).decode()
         
         return api_key, api_secret
     
@@ -140,12 +195,58 @@ class ApiService:
             Success status
         """
         if exchange not in self.exchange_keys or not self.exchange_keys[exchange]["enabled"]:
-            self.logger.error(f"Exchange {exchange} not configured")
+            self.logger.error("Exchange %s not configured", exchange)
             return False
         
         self.active_exchange = exchange
         return True
     
+    def _request_json(self, url: str, params: Mapping[str, Any]) -> Any:
+        """
+        Fetch JSON from an external API, coalescing concurrent identical requests.
+        Callers with the same URL and params share one in-flight request; followers
+        wait for it and receive its result or re-raise its exception.
+        
+        Args:
+            url: Request URL
+            params: Query parameters
+            
+        Returns:
+            Decoded JSON response
+        """
+        request_key = (url, tuple(sorted(params.items())))
+        
+        with self._inflight_lock:
+            call = self._inflight.get(request_key)
+            is_leader = call is None
+            if is_leader:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self._inflight[request_key] = call
+        
+        if not is_leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+        
+        try:
+            response = self.session.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            
+            # Parse the raw body bytes with orjson instead of response.json()
+            try:
+                call["result"] = orjson.loads(response.content)
+            except orjson.JSONDecodeError as e:
+                raise InvalidJSONError(str(e), response=response)
+            return call["result"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[request_key]
+            call["done"].set()
+    
     def get_top_markets(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Get top cryptocurrency market data
@@ -156,59 +257,46 @@ class ApiService:
         Returns:
             List of cryptocurrency market data
         """
-        cache_key = f"top_markets_{limit}"
+        cache_key = ("top_markets", limit)
         
         # Check cache first
-        if cache_key in self.cache["market_data"]:
-            cached_data = self.cache["market_data"][cache_key]
-            if time.time() - cached_data["timestamp"] < self.cache_expiration["market_data"]:
-                return cached_data["data"]
+        cached = self.cache["market_data"].get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
-            response = requests.get(
-                f"{self.api_urls['coingecko']}/coins/markets",
-                params={
-                    "vs_currency": "usd",
-                    "order": "market_cap_desc",
-                    "per_page": limit,
-                    "page": 1,
-                    "sparkline": "false",
-                    "price_change_percentage": "24h"
-                },
-                timeout=10
+            data = self._request_json(
+                self._markets_url,
+                params={**self.MARKETS_PARAMS, "per_page": limit}
             )
             
-            response.raise_for_status()
-            data = response.json()
-            
             # Add market regime (this would be calculated by the market analyzer)
             # For now, we'll just assign random regimes for demonstration purposes
-            import random
             regimes = ["trending", "sideways", "volatile"]
+            regime_indices = self._rng.integers(0, len(regimes), size=len(data))
+            confidences = np.round(self._rng.random(len(data)) * 100).astype(int)
             
-            enhanced_data = []
-            for coin in data:
-                coin_regime = random.choice(regimes)
-                enhanced_data.append({
+            enhanced_data = [
+                {
                     **coin,
-                    "regime": coin_regime,
-                    "confidence": round(random.random() * 100)
-                })
+                    "regime": regimes[regime_index],
+                    "confidence": confidence
+                }
+                for coin, regime_index, confidence in zip(data, regime_indices.tolist(), confidences.tolist())
+            ]
             
             # Cache the result
-            self.cache["market_data"][cache_key] = {
-                "data": enhanced_data,
-                "timestamp": time.time()
-            }
+            self.cache["market_data"].set(cache_key, enhanced_data)
             
             return enhanced_data
         
         except RequestException as e:
-            self.logger.error(f"Failed to fetch market data: {str(e)}")
+            self.logger.error("Failed to fetch market data: %s", e)
             
             # Return cached data if available, even if expired
-            if cache_key in self.cache["market_data"]:
-                return self.cache["market_data"][cache_key]["data"]
+            cached = self.cache["market_data"].get_stale(cache_key)
+            if cached is not None:
+                return cached
             
             # Return empty list if no data is available
             return []
@@ -224,58 +312,95 @@ class ApiService:
         Returns:
             Historical price data
         """
-        cache_key = f"{coin_id}_{days}"
+        cache_key = (coin_id, days)
         
         # Check cache first
-        if cache_key in self.cache["historical_data"]:
-            cached_data = self.cache["historical_data"][cache_key]
-            if time.time() - cached_data["timestamp"] < self.cache_expiration["historical_data"]:
-                return cached_data["data"]
+        cached = self.cache["historical_data"].get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
-            response = requests.get(
-                f"{self.api_urls['coingecko']}/coins/{coin_id}/market_chart",
-                params={"vs_currency": "usd", "days": days},
-                timeout=10
+            data = self._request_json(
+                f"{self._coins_url}/{coin_id}/market_chart",
+                params={"vs_currency": "usd", "days": days}
             )
             
-            response.raise_for_status()
-            data = response.json()
-            
             # Process the data for charting
+            prices = np.asarray(data["prices"], dtype=np.float64).reshape(-1, 2)
+            times = self._format_timestamps(prices[:, 0])
+            
             processed_data = {
-                "prices": [
-                    {"time": datetime.fromtimestamp(timestamp / 1000).isoformat(), "value": price}
-                    for timestamp, price in data["prices"]
-                ],
-                "market_caps": [
-                    {"time": datetime.fromtimestamp(timestamp / 1000).isoformat(), "value": market_cap}
-                    for timestamp, market_cap in data["market_caps"]
-                ],
-                "total_volumes": [
-                    {"time": datetime.fromtimestamp(timestamp / 1000).isoformat(), "value": volume}
-                    for timestamp, volume in data["total_volumes"]
-                ]
+                "prices": self._to_series(prices, prices, times),
+                "market_caps": self._to_series(data["market_caps"], prices, times),
+                "total_volumes": self._to_series(data["total_volumes"], prices, times)
             }
             
             # Cache the result
-            self.cache["historical_data"][cache_key] = {
-                "data": processed_data,
-                "timestamp": time.time()
-            }
+            self.cache["historical_data"].set(cache_key, processed_data)
             
             return processed_data
         
         except RequestException as e:
-            self.logger.error(f"Failed to fetch historical data for {coin_id}: {str(e)}")
+            self.logger.error("Failed to fetch historical data for %s: %s", coin_id, e)
             
             # Return cached data if available, even if expired
-            if cache_key in self.cache["historical_data"]:
-                return self.cache["historical_data"][cache_key]["data"]
+            cached = self.cache["historical_data"].get_stale(cache_key)
+            if cached is not None:
+                return cached
             
             # Return empty object if no data is available
             return {"prices": [], "market_caps": [], "total_volumes": []}
     
+    def get_historical_data_many(self, coin_ids: List[str], days: str = "30") -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """
+        Get historical price data for several cryptocurrencies concurrently
+        
+        Args:
+            coin_ids: List of coin IDs
+            days: Number of days (1, 7, 30, 90, 365, max)
+            
+        Returns:
+            Historical price data keyed by coin ID
+        """
+        results = self.pool.map(lambda coin_id: self.get_historical_data(coin_id, days), coin_ids)
+        return dict(zip(coin_ids, results))
+    
+    @staticmethod
+    def _format_timestamps(timestamps_ms: np.ndarray) -> List[str]:
+        """
+        Format millisecond epoch timestamps as ISO 8601 strings in one vectorized call
+        
+        Args:
+            timestamps_ms: Array of millisecond timestamps
+            
+        Returns:
+            List of ISO 8601 strings (UTC with a trailing 'Z', second precision)
+        """
+        # The explicit 'Z' keeps clients (e.g. the browser's Date parser) from reading the times as local
+        return np.datetime_as_string(
+            timestamps_ms.astype(np.int64).astype("datetime64[ms]"), unit="s", timezone="UTC"
+        ).tolist()
+    
+    def _to_series(self, points: Any, prices: np.ndarray, times: List[str]) -> List[Dict[str, Any]]:
+        """
+        Convert [timestamp, value] pairs to chart points
+        
+        Args:
+            points: [timestamp, value] pairs (list or array)
+            prices: Price array whose formatted timestamps are given in times
+            times: Formatted timestamps of the price array
+            
+        Returns:
+            List of {"time", "value"} points
+        """
+        arr = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        
+        # The series normally share timestamps, so only format them again if they differ
+        if not np.array_equal(arr[:, 0], prices[:, 0]):
+            times = self._format_timestamps(arr[:, 0])
+        
+        return [{"time": time, "value": value} for time, value in zip(times, arr[:, 1].tolist())]
+    
     def get_coin_details(self, coin_id: str) -> Optional[Dict[str, Any]]:
         """
         Get detailed information about a cryptocurrency
@@ -286,45 +411,31 @@ class ApiService:
         Returns:
             Detailed coin information
         """
-        cache_key = f"coin_details_{coin_id}"
+        cache_key = ("coin_details", coin_id)
         
         # Check cache first
-        if cache_key in self.cache["market_data"]:
-            cached_data = self.cache["market_data"][cache_key]
-            if time.time() - cached_data["timestamp"] < self.cache_expiration["market_data"]:
-                return cached_data["data"]
+        cached = self.cache["market_data"].get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
-            response = requests.get(
-                f"{self.api_urls['coingecko']}/coins/{coin_id}",
-                params={
-                    "localization": "false",
-                    "tickers": "false",
-                    "market_data": "true",
-                    "community_data": "false",
-                    "developer_data": "false",
-                    "sparkline": "false"
-                },
-                timeout=10
+            data = self._request_json(
+                f"{self._coins_url}/{coin_id}",
+                params=self.COIN_DETAILS_PARAMS
             )
             
-            response.raise_for_status()
-            data = response.json()
-            
             # Cache the result
-            self.cache["market_data"][cache_key] = {
-                "data": data,
-                "timestamp": time.time()
-            }
+            self.cache["market_data"].set(cache_key, data)
             
             return data
         
         except RequestException as e:
-            self.logger.error(f"Failed to fetch details for {coin_id}: {str(e)}")
+            self.logger.error("Failed to fetch details for %s: %s", coin_id, e)
             
             # Return cached data if available, even if expired
-            if cache_key in self.cache["market_data"]:
-                return self.cache["market_data"][cache_key]["data"]
+            cached = self.cache["market_data"].get_stale(cache_key)
+            if cached is not None:
+                return cached
             
             # Return None if no data is available
             return None
@@ -342,44 +453,31 @@ class ApiService:
         if not coin_ids:
             return {}
         
-        cache_key = f"multiple_prices_{'_'.join(coin_ids)}"
+        cache_key = ("multiple_prices", tuple(coin_ids))
         
         # Check cache first
-        if cache_key in self.cache["market_data"]:
-            cached_data = self.cache["market_data"][cache_key]
-            if time.time() - cached_data["timestamp"] < self.cache_expiration["market_data"]:
-                return cached_data["data"]
+        cached = self.cache["market_data"].get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
-            response = requests.get(
-                f"{self.api_urls['coingecko']}/simple/price",
-                params={
-                    "ids": ",".join(coin_ids),
-                    "vs_currencies": "usd",
-                    "include_market_cap": "true",
-                    "include_24hr_vol": "true",
-                    "include_24hr_change": "true"
-                },
-                timeout=10
+            data = self._request_json(
+                self._simple_price_url,
+                params={**self.MULTIPLE_PRICES_PARAMS, "ids": ",".join(coin_ids)}
             )
             
-            response.raise_for_status()
-            data = response.json()
-            
             # Cache the result
-            self.cache["market_data"][cache_key] = {
-                "data": data,
-                "timestamp": time.time()
-            }
+            self.cache["market_data"].set(cache_key, data)
             
             return data
         
         except RequestException as e:
-            self.logger.error(f"Failed to fetch multiple prices: {str(e)}")
+            self.logger.error("Failed to fetch multiple prices: %s", e)
             
             # Return cached data if available, even if expired
-            if cache_key in self.cache["market_data"]:
-                return self.cache["market_data"][cache_key]["data"]
+            cached = self.cache["market_data"].get_stale(cache_key)
+            if cached is not None:
+                return cached
             
             # Return empty object if no data is available
             return {}
@@ -396,15 +494,12 @@ class ApiService:
         """
         # In a real system, this would use historical price data to calculate correlations
         # For demonstration, we'll generate random correlation data
-        import random
-        
-        cache_key = f"correlations_{base_coin}"
+        cache_key = ("correlations", base_coin)
         
         # Check cache first
-        if cache_key in self.cache["market_data"]:
-            cached_data = self.cache["market_data"][cache_key]
-            if time.time() - cached_data["timestamp"] < self.cache_expiration["market_data"]:
-                return cached_data["data"]
+        cached = self.cache["market_data"].get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             # Get top markets first
@@ -414,39 +509,38 @@ class ApiService:
             other_coins = [coin for coin in top_markets if coin["id"] != base_coin]
             
             # Generate correlation data
+            correlation_scores = 0.5 + (self._rng.random(len(other_coins)) * 0.5)  # Random correlation between 0.5 and 1.0
+            performance_deltas = (self._rng.random(len(other_coins)) * 40) - 20  # Random performance delta between -20% and +20%
+            
+            # Order by correlation score (descending) on the score array itself
+            order = np.argsort(-correlation_scores, kind="stable")
+            
             correlations = []
-            for coin in other_coins:
-                correlation_score = 0.5 + (random.random() * 0.5)  # Random correlation between 0.5 and 1.0
-                performance_delta = (random.random() * 40) - 20  # Random performance delta between -20% and +20%
-                
+            for i in order.tolist():
+                coin = other_coins[i]
                 correlations.append({
                     "id": coin["id"],
                     "symbol": coin["symbol"].upper(),
                     "name": coin["name"],
-                    "correlation_score": correlation_score,
-                    "performance_delta": performance_delta,
+                    "correlation_score": float(correlation_scores[i]),
+                    "performance_delta": float(performance_deltas[i]),
                     "current_price": coin["current_price"],
                     "volume": coin["total_volume"],
                     "market_cap": coin["market_cap"]
                 })
             
-            # Sort by correlation score (descending)
-            correlations.sort(key=lambda x: x["correlation_score"], reverse=True)
-            
             # Cache the result
-            self.cache["market_data"][cache_key] = {
-                "data": correlations,
-                "timestamp": time.time()
-            }
+            self.cache["market_data"].set(cache_key, correlations)
             
             return correlations
         
         except Exception as e:
-            self.logger.error(f"Failed to get correlations for {base_coin}: {str(e)}")
+            self.logger.error("Failed to get correlations for %s: %s", base_coin, e)
             
             # Return cached data if available, even if expired
-            if cache_key in self.cache["market_data"]:
-                return self.cache["market_data"][cache_key]["data"]
+            cached = self.cache["market_data"].get_stale(cache_key)
+            if cached is not None:
+                return cached
             
             # Return empty array if no data is available
             return []
@@ -466,8 +560,7 @@ class ApiService:
         """
         if simulation:
             # Simulate trade
-            import random
-            price = random.uniform(30000, 40000) if "BTC" in symbol else random.uniform(1000, 2000)
+            price = float(self._rng.uniform(30000, 40000) if "BTC" in symbol else self._rng.uniform(1000, 2000))
             return {
                 "success": True,
                 "simulation": True,
@@ -489,7 +582,7 @@ class ApiService:
             # Execute trade based on the active exchange
             # This would involve calling the exchange-specific API
             # For now, we'll just return a simulated trade
-            self.logger.info(f"Executing {side} trade for {quantity} {symbol}")
+            self.logger.info("Executing %s trade for %s %s", side, quantity, symbol)
             
             # Placeholder for real trading logic
             
@@ -2,18 +2,273 @@
 Market Analyzer module for Crypto Trading Bot
 Analyzes market conditions and detects market regimes
 """
-import time
+import math
 import logging
+import threading
+from operator import itemgetter
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, NamedTuple, Optional, Any
 from datetime import datetime
+from cachetools import LRUCache
+from utils.cache import StaleTTLCache
+from utils.jit import njit, NUMBA_AVAILABLE
+
+class MACDResult(NamedTuple):
+    """MACD line, signal line and histogram"""
+    value: float
+    signal: float
+    histogram: float
+
+class BBResult(NamedTuple):
+    """Bollinger Bands values"""
+    upper: float
+    middle: float
+    lower: float
+
+_EMPTY_MACD = MACDResult(0, 0, 0)
+
+# Field getters for historical data points ({"time": ..., "value": ...})
+_get_time = itemgetter("time")
+_get_value = itemgetter("value")
+
+# Kernels are compiled eagerly with explicit signatures, so the compile (or on-disk cache load)
+# happens at import instead of inside the first request that reaches them
+
+@njit("float64[::1](float64[::1], int64, float64)", cache=True, fastmath=True)
+def _ema_recurrence(prices: np.ndarray, period: int, multiplier: float) -> np.ndarray:
+    """
+    EMA recurrence over a float64 array, seeded with the SMA of the first period
+    
+    Args:
+        prices: Contiguous float64 array of prices
+        period: EMA period
+        multiplier: Smoothing factor (2 / (period + 1) for EMA, 1 / period for Wilder)
+        
+    Returns:
+        EMA value at every index (values before the seed are the prices themselves)
+    """
+    out = prices.copy()
+    if len(out) < period:
+        return out
+    
+    ema = np.mean(out[:period])
+    out[period - 1] = ema
+    for i in range(period, len(out)):
+        ema = (out[i] - ema) * multiplier + ema
+        out[i] = ema
+    
+    return out
+
+@njit("float64[:, ::1](float64[::1], int64[::1])", cache=True, fastmath=True)
+def _multi_ema_kernel(prices: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """
+    Several SMA-seeded EMA series computed in a single pass over the prices
+    
+    Args:
+        prices: Contiguous float64 array of prices
+        periods: int64 array of EMA periods
+        
+    Returns:
+        Array of shape (len(periods), len(prices)), one EMA series per row
+    """
+    n = len(prices)
+    out = np.empty((len(periods), n))
+    emas = np.zeros(len(periods))
+    multipliers = 2.0 / (periods + 1.0)
+    
+    for i in range(n):
+        price = prices[i]
+        for j in range(len(periods)):
+            period = periods[j]
+            if i < period - 1:
+                # Accumulate the SMA seed, the series is the price itself until then
+                emas[j] += price
+                out[j, i] = price
+            elif i == period - 1:
+                emas[j] = (emas[j] + price) / period
+                out[j, i] = emas[j]
+            else:
+                emas[j] = (price - emas[j]) * multipliers[j] + emas[j]
+                out[j, i] = emas[j]
+    
+    return out
+
+def _ema_recurrence_pandas(prices: np.ndarray, period: int, multiplier: float) -> np.ndarray:
+    """
+    Same recurrence as _ema_recurrence, run through pandas' compiled ewm kernel
+    
+    ewm(adjust=False) computes y[t] = (1 - alpha) * y[t-1] + alpha * x[t] starting from x[0],
+    so replacing the first input with the SMA seed gives the seeded EMA exactly.
+    """
+    out = prices.copy()
+    if len(out) < period:
+        return out
+    
+    seeded = out[period - 1:]
+    seeded[0] = np.mean(out[:period])
+    out[period - 1:] = pd.Series(seeded).ewm(alpha=multiplier, adjust=False).mean().to_numpy()
+    
+    return out
+
+def _multi_ema_pandas(prices: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """Same output as _multi_ema_kernel, one pandas ewm pass per period"""
+    return np.vstack([_ema_recurrence_pandas(prices, period, 2 / (period + 1)) for period in periods])
+
+if not NUMBA_AVAILABLE:
+    # The interpreted loops are far slower than pandas' Cython ewm when Numba is missing
+    _ema_recurrence = _ema_recurrence_pandas
+    _multi_ema_kernel = _multi_ema_pandas
+
+def _multi_ema(prices, periods) -> Dict[int, np.ndarray]:
+    """
+    Calculate EMA series for several periods in one pass
+    
+    Args:
+        prices: Array of prices
+        periods: EMA periods (duplicates are computed once)
+        
+    Returns:
+        Dictionary mapping period to its EMA series
+    """
+    unique_periods = tuple(dict.fromkeys(periods))
+    rows = _multi_ema_kernel(
+        np.ascontiguousarray(prices, dtype=np.float64),
+        np.array(unique_periods, dtype=np.int64)
+    )
+    return dict(zip(unique_periods, rows))
+
+@njit("float64(float64[::1])", cache=True)
+def _welford_return_std(prices: np.ndarray) -> float:
+    """
+    Population standard deviation of simple returns in one pass (Welford's algorithm)
+    
+    Args:
+        prices: Contiguous float64 array of at least two prices
+        
+    Returns:
+        Standard deviation of returns
+    """
+    mean = 0.0
+    m2 = 0.0
+    for i in range(1, prices.size):
+        r = (prices[i] - prices[i - 1]) / prices[i - 1]
+        d = r - mean
+        mean += d / i
+        m2 += d * (r - mean)
+    
+    return np.sqrt(m2 / (prices.size - 1))
+
+def _fast_std(values: np.ndarray) -> float:
+    """
+    Population standard deviation as sqrt(E[x^2] - E[x]^2), without a centered temporary
+    
+    Only suitable where the mean is small relative to the spread (e.g. returns), not raw prices.
+    """
+    mean = values.mean()
+    return math.sqrt(max(np.dot(values, values) / values.size - mean * mean, 0.0))
+
+def _return_std_numpy(prices: np.ndarray) -> float:
+    """Same result as _welford_return_std with vectorized NumPy"""
+    return _fast_std(np.diff(prices) / prices[:-1])
+
+if not NUMBA_AVAILABLE:
+    # An interpreted Welford loop is slower than two vectorized passes
+    _welford_return_std = _return_std_numpy
+
+def _rolling_sma_std(prices: np.ndarray, period: int):
+    """
+    Rolling mean and population standard deviation for every full window, from cumulative sums
+    
+    Args:
+        prices: Array of prices (at least period long)
+        period: Window length
+        
+    Returns:
+        Tuple of (sma_series, std_series), entry i covering prices[i:i + period]
+    """
+    # Center on the overall mean so the sum of squares doesn't cancel catastrophically
+    offset = np.mean(prices)
+    centered = prices - offset
+    
+    cs = np.concatenate(([0.0], np.cumsum(centered)))
+    cs2 = np.concatenate(([0.0], np.cumsum(centered * centered)))
+    
+    mean = (cs[period:] - cs[:-period]) / period
+    var = (cs2[period:] - cs2[:-period]) / period - mean * mean
+    
+    return mean + offset, np.sqrt(np.maximum(var, 0.0))
+
+def _ema_series(prices, period: int) -> np.ndarray:
+    """
+    Calculate the full EMA series in one pass, seeded with the SMA of the first period
+    
+    Args:
+        prices: Array of prices
+        period: EMA period
+        
+    Returns:
+        EMA value at every index (values before the seed are the prices themselves)
+    """
+    return _ema_recurrence(np.ascontiguousarray(prices, dtype=np.float64), period, 2 / (period + 1))
+
+def _wilder_average(values: np.ndarray, period: int) -> float:
+    """
+    Wilder's smoothed average (an EMA with alpha = 1 / period, seeded with the SMA)
+    
+    Args:
+        values: Contiguous float64 array of values
+        period: Smoothing period
+        
+    Returns:
+        Final smoothed value
+    """
+    return float(_ema_recurrence(values, period, 1 / period)[-1])
+
+def _rsi_series(prices, period: int) -> np.ndarray:
+    """
+    Calculate the full RSI series, with Wilder's smoothing of gains and losses
+    
+    Args:
+        prices: Array of prices
+        period: RSI period
+        
+    Returns:
+        RSI value at every index (50 until there are more than period prices)
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    out = np.full(prices.size, 50.0)
+    if prices.size <= period:
+        return out
+    
+    deltas = np.diff(prices)
+    
+    # Wilder averages are seeded at delta period - 1, which is the change into price index period
+    avg_gain = _ema_recurrence(np.clip(deltas, 0.0, None), period, 1 / period)[period - 1:]
+    avg_loss = _ema_recurrence(np.clip(-deltas, 0.0, None), period, 1 / period)[period - 1:]
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[period:] = np.where(avg_loss == 0, 100.0, 100 - (100 / (1 + avg_gain / avg_loss)))
+    
+    return out
 
 class MarketAnalyzer:
     """Analyzes cryptocurrency market conditions and provides trading signals"""
     
-    def __init__(self):
-        """Initialize the market analyzer with indicators configuration"""
+    def __init__(self, api_service=None):
+        """
+        Initialize the market analyzer with indicators configuration
+        
+        Args:
+            api_service: API service instance used to fetch historical data (a new one if omitted)
+        """
+        if api_service is None:
+            # Standalone use (scripts, testing) without the app factory
+            from services.api_service import ApiService
+            api_service = ApiService()
+        
+        self.api_service = api_service
+        
         # Technical indicators configuration
         self.indicators = {
             "ema": {
@@ -52,18 +307,22 @@ class MarketAnalyzer:
             }
         }
         
-        # Cache for analysis results
-        self.cache = {
-            "regime_detection": {},
-            "technical_analysis": {}
-        }
-        
         # Cache expiration (in seconds)
         self.cache_expiration = {
             "regime_detection": 300,  # 5 minutes
             "technical_analysis": 300  # 5 minutes
         }
         
+        # Bounded caches for analysis results keyed by symbol, keeping the last result as a fallback for failed analysis
+        self.cache = {
+            "regime_detection": StaleTTLCache(maxsize=1024, ttl=self.cache_expiration["regime_detection"]),
+            "technical_analysis": StaleTTLCache(maxsize=1024, ttl=self.cache_expiration["technical_analysis"])
+        }
+        
+        # symbol -> (historical data object, float64 price array built from it)
+        self._price_arrays = LRUCache(maxsize=1024)
+        self._price_array_lock = threading.Lock()
+        
         self.logger = logging.getLogger(__name__)
     
     def analyze_market(self, symbol: str, historical_data: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> Dict[str, Any]:
@@ -77,33 +336,21 @@ class MarketAnalyzer:
         Returns:
             Market analysis results
         """
-        cache_key = f"regime_{symbol}"
-        
         # Check cache first
-        if cache_key in self.cache["regime_detection"]:
-            cached_data = self.cache["regime_detection"][cache_key]
-            if time.time() - cached_data["timestamp"] < self.cache_expiration["regime_detection"]:
-                return cached_data["data"]
+        cached = self.cache["regime_detection"].get(symbol)
+        if cached is not None:
+            return cached
         
         try:
             # Use provided historical data or fetch it from API service
             if not historical_data:
-                # This function should be implemented by the API service
-                # For now, we'll handle it differently in testing vs. production
-                from flask import current_app
-                if current_app:
-                    historical_data = current_app.api_service.get_historical_data(symbol, "30")
-                else:
-                    # Fallback to direct import for testing
-                    from services.api_service import ApiService
-                    api_service = ApiService()
-                    historical_data = api_service.get_historical_data(symbol, "30")
+                historical_data = self.api_service.get_historical_data(symbol, "30")
             
             if not historical_data or not historical_data.get("prices") or len(historical_data["prices"]) == 0:
                 raise ValueError("No historical data available")
             
             # Extract prices for analysis
-            prices = [item["value"] for item in historical_data["prices"]]
+            prices = self.get_price_array(symbol, historical_data)
             
             # Calculate volatility
             volatility = self.calculate_volatility(prices)
@@ -111,36 +358,24 @@ class MarketAnalyzer:
             # Calculate trend strength
             trend_strength = self.calculate_trend_strength(prices)
             
-            # Detect market regime
-            regime = self.detect_regime(volatility, trend_strength)
-            
-            # Calculate confidence
-            confidence = self.calculate_confidence(volatility, trend_strength, regime)
+            if not (math.isfinite(volatility) and math.isfinite(trend_strength)):
+                raise ValueError("Historical prices contain non-finite values")
             
-            # Create analysis result
-            result = {
-                "symbol": symbol,
-                "regime": regime,
-                "volatility": volatility,
-                "trend_strength": trend_strength,
-                "confidence": confidence,
-                "timestamp": datetime.now().isoformat()
-            }
+            # Detect market regime and create analysis result
+            result = self._regime_result(symbol, volatility, trend_strength)
             
             # Cache the result
-            self.cache["regime_detection"][cache_key] = {
-                "data": result,
-                "timestamp": time.time()
-            }
+            self.cache["regime_detection"].set(symbol, result)
             
             return result
         
         except Exception as e:
-            self.logger.error(f"Failed to analyze market for {symbol}: {str(e)}")
+            self.logger.error("Failed to analyze market for %s: %s", symbol, e)
             
             # Return cached data if available, even if expired
-            if cache_key in self.cache["regime_detection"]:
-                return self.cache["regime_detection"][cache_key]["data"]
+            cached = self.cache["regime_detection"].get_stale(symbol)
+            if cached is not None:
+                return cached
             
             # Return default analysis if no data is available
             return {
@@ -152,7 +387,127 @@ class MarketAnalyzer:
                 "timestamp": datetime.now().isoformat()
             }
     
-    def calculate_volatility(self, prices: List[float]) -> float:
+    def analyze_markets_batch(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze market conditions for several symbols at once
+        
+        Price series are aligned by position (each truncated to the common tail length) as the
+        columns of one 2-D array, so volatility and trend strength for every uncached symbol come
+        from one set of column-wise reductions.
+        
+        Args:
+            symbols: Cryptocurrency symbols (e.g., bitcoin)
+            
+        Returns:
+            Market analysis results keyed by symbol
+        """
+        results = {}
+        pending = []
+        
+        # Serve what we can from the cache
+        for symbol in dict.fromkeys(symbols):
+            cached = self.cache["regime_detection"].get(symbol)
+            if cached is not None:
+                results[symbol] = cached
+            else:
+                pending.append(symbol)
+        
+        if not pending:
+            return results
+        
+        # Fetch historical data for the remaining symbols concurrently
+        historical = self.api_service.get_historical_data_many(pending, "30")
+        
+        # Series long enough for a trend reading and free of NaN/inf (the rest take the single-symbol path)
+        columns = {}
+        for symbol in pending:
+            data = historical.get(symbol)
+            if data and data.get("prices"):
+                prices = self.get_price_array(symbol, data)
+                if prices.size >= 14 and np.isfinite(prices).all():
+                    columns[symbol] = prices
+        
+        if columns:
+            length = min(prices.size for prices in columns.values())
+            matrix = np.column_stack([prices[-length:] for prices in columns.values()])
+            diffs = np.diff(matrix, axis=0)
+            
+            # Standard deviation of returns per column
+            with np.errstate(divide="ignore", invalid="ignore"):
+                volatility = (diffs / matrix[:-1]).std(axis=0)
+            
+            # Share of moves in the dominant direction, flat steps excluded
+            up_moves = np.count_nonzero(diffs > 0, axis=0)
+            total_moves = diffs.shape[0] - np.count_nonzero(diffs == 0, axis=0)
+            dominant_moves = np.maximum(up_moves, total_moves - up_moves)
+            trend_strength = np.where(total_moves > 0, dominant_moves / np.maximum(total_moves, 1) * 100, 0.0)
+            
+            for symbol, vol, trend in zip(columns, volatility.tolist(), trend_strength.tolist()):
+                # Zero prices give infinite returns; leave those symbols to the single-symbol path
+                if not math.isfinite(vol):
+                    continue
+                
+                result = self._regime_result(symbol, vol, trend)
+                self.cache["regime_detection"].set(symbol, result)
+                results[symbol] = result
+        
+        # Symbols without usable data take the single-symbol path (stale cache or default result)
+        for symbol in pending:
+            if symbol not in results:
+                results[symbol] = self.analyze_market(symbol, historical.get(symbol))
+        
+        return results
+    
+    def _regime_result(self, symbol: str, volatility: float, trend_strength: float) -> Dict[str, Any]:
+        """
+        Detect the market regime and build the analysis result
+        
+        Args:
+            symbol: Cryptocurrency symbol
+            volatility: Volatility value
+            trend_strength: Trend strength value
+            
+        Returns:
+            Market analysis result
+        """
+        regime = self.detect_regime(volatility, trend_strength)
+        
+        return {
+            "symbol": symbol,
+            "regime": regime,
+            "volatility": volatility,
+            "trend_strength": trend_strength,
+            "confidence": self.calculate_confidence(volatility, trend_strength, regime),
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def get_price_array(self, symbol: str, historical_data: Dict[str, List[Dict[str, Any]]]) -> np.ndarray:
+        """
+        Get the price series as a float64 array, reusing the last one built for this symbol
+        
+        Args:
+            symbol: Cryptocurrency symbol (e.g., bitcoin)
+            historical_data: Historical data with a "prices" list of {"time", "value"} points
+            
+        Returns:
+            Array of prices, shared by every caller passing the same data object (do not modify)
+        """
+        # ApiService hands out the same cached object until it refreshes the data, so identity
+        # is an exact change check (the entry holds a reference, so the object can't be recycled)
+        with self._price_array_lock:
+            cached = self._price_arrays.get(symbol)
+        if cached is not None and cached[0] is historical_data:
+            return cached[1]
+        
+        # Kept writable: the compiled kernels' signatures only accept writable arrays
+        points = historical_data["prices"]
+        prices = np.fromiter(map(_get_value, points), dtype=np.float64, count=len(points))
+        with self._price_array_lock:
+            self._price_arrays[symbol] = (historical_data, prices)
+        
+        return prices
+    
+    def calculate_volatility(self, prices: np.ndarray) -> float:
         """
         Calculate price volatility (standard deviation of returns)
         
@@ -165,18 +520,12 @@ class MarketAnalyzer:
         if len(prices) < 2:
             return 0
         
-        # Convert to numpy array
-        prices_array = np.array(prices)
-        
-        # Calculate returns
-        returns = np.diff(prices_array) / prices_array[:-1]
-        
-        # Calculate standard deviation
-        volatility = np.std(returns)
+        # Standard deviation of returns without building the returns array
+        volatility = _welford_return_std(np.ascontiguousarray(prices, dtype=np.float64))
         
         return float(volatility)
     
-    def calculate_trend_strength(self, prices: List[float]) -> float:
+    def calculate_trend_strength(self, prices: np.ndarray) -> float:
         """
         Calculate trend strength using ADX-like indicator
         
@@ -194,11 +543,11 @@ class MarketAnalyzer:
         
         # Calculate price direction
         price_diff = np.diff(prices)
-        up_moves = np.sum(price_diff > 0)
-        down_moves = np.sum(price_diff < 0)
+        up_moves = np.count_nonzero(price_diff > 0)
         
-        # Calculate trend consistency
-        total_moves = up_moves + down_moves
+        # Calculate trend consistency (flat steps don't count as moves)
+        total_moves = price_diff.size - np.count_nonzero(price_diff == 0)
+        down_moves = total_moves - up_moves
         dominant_moves = max(up_moves, down_moves)
         
         if total_moves == 0:
@@ -318,48 +667,50 @@ class MarketAnalyzer:
         Returns:
             Technical analysis results
         """
-        cache_key = f"technicals_{symbol}"
-        
         # Check cache first
-        if cache_key in self.cache["technical_analysis"]:
-            cached_data = self.cache["technical_analysis"][cache_key]
-            if time.time() - cached_data["timestamp"] < self.cache_expiration["technical_analysis"]:
-                return cached_data["data"]
+        cached = self.cache["technical_analysis"].get(symbol)
+        if cached is not None:
+            return cached
         
         try:
             # Use provided historical data or fetch it from API service
             if not historical_data:
-                # This function should be implemented by the API service
-                # For now, we'll handle it differently in testing vs. production
-                from flask import current_app
-                if current_app:
-                    historical_data = current_app.api_service.get_historical_data(symbol, "30")
-                else:
-                    # Fallback to direct import for testing
-                    from services.api_service import ApiService
-                    api_service = ApiService()
-                    historical_data = api_service.get_historical_data(symbol, "30")
+                historical_data = self.api_service.get_historical_data(symbol, "30")
             
             if not historical_data or not historical_data.get("prices") or len(historical_data["prices"]) == 0:
                 raise ValueError("No historical data available")
             
             # Extract prices for analysis
-            prices = [item["value"] for item in historical_data["prices"]]
+            prices = self.get_price_array(symbol, historical_data)
+            
+            ema_periods = self.indicators["ema"]
+            macd_periods = self.indicators["macd"]
+            
+            # Calculate every EMA series needed (EMA and MACD periods) in one pass
+            emas = _multi_ema(prices, (
+                ema_periods["short"],
+                ema_periods["medium"],
+                ema_periods["long"],
+                macd_periods["fast"],
+                macd_periods["slow"]
+            ))
             
             # Calculate EMA indicators
-            short_ema = self.calculate_ema(prices, self.indicators["ema"]["short"])
-            medium_ema = self.calculate_ema(prices, self.indicators["ema"]["medium"])
-            long_ema = self.calculate_ema(prices, self.indicators["ema"]["long"])
+            short_ema = float(emas[ema_periods["short"]][-1])
+            medium_ema = float(emas[ema_periods["medium"]][-1])
+            long_ema = float(emas[ema_periods["long"]][-1])
             
             # Calculate RSI
             rsi = self.calculate_rsi(prices, self.indicators["rsi"]["period"])
             
-            # Calculate MACD
+            # Calculate MACD from the fast and slow EMA series
             macd = self.calculate_macd(
                 prices,
-                self.indicators["macd"]["fast"],
-                self.indicators["macd"]["slow"],
-                self.indicators["macd"]["signal"]
+                macd_periods["fast"],
+                macd_periods["slow"],
+                macd_periods["signal"],
+                fast_series=emas[macd_periods["fast"]],
+                slow_series=emas[macd_periods["slow"]]
             )
             
             # Calculate Bollinger Bands
@@ -370,7 +721,7 @@ class MarketAnalyzer:
             )
             
             # Determine overall signal
-            current_price = prices[-1]
+            current_price = float(prices[-1])
             signal = self.determine_signal(current_price, short_ema, medium_ema, rsi, macd)
             
             # Create analysis result
@@ -383,26 +734,24 @@ class MarketAnalyzer:
                     "long": long_ema
                 },
                 "rsi": rsi,
-                "macd": macd,
-                "bollinger": bollinger,
+                "macd": macd._asdict(),
+                "bollinger": bollinger._asdict(),
                 "signal": signal,
                 "timestamp": datetime.now().isoformat()
             }
             
             # Cache the result
-            self.cache["technical_analysis"][cache_key] = {
-                "data": result,
-                "timestamp": time.time()
-            }
+            self.cache["technical_analysis"].set(symbol, result)
             
             return result
         
         except Exception as e:
-            self.logger.error(f"Failed to analyze technicals for {symbol}: {str(e)}")
+            self.logger.error("Failed to analyze technicals for %s: %s", symbol, e)
             
             # Return cached data if available, even if expired
-            if cache_key in self.cache["technical_analysis"]:
-                return self.cache["technical_analysis"][cache_key]["data"]
+            cached = self.cache["technical_analysis"].get_stale(symbol)
+            if cached is not None:
+                return cached
             
             # Return empty analysis if no data is available
             return {
@@ -416,7 +765,7 @@ class MarketAnalyzer:
                 "timestamp": datetime.now().isoformat()
             }
     
-    def calculate_ema(self, prices: List[float], period: int) -> float:
+    def calculate_ema(self, prices: np.ndarray, period: int) -> float:
         """
         Calculate Exponential Moving Average (EMA)
         
@@ -428,24 +777,11 @@ class MarketAnalyzer:
             EMA value
         """
         if len(prices) < period:
-            return prices[-1]
-        
-        prices_array = np.array(prices)
-        
-        # Calculate simple moving average (SMA) for the initial value
-        sma = np.mean(prices_array[:period])
-        
-        # Calculate the multiplier
-        multiplier = 2 / (period + 1)
-        
-        # Calculate EMA
-        ema = sma
-        for i in range(period, len(prices_array)):
-            ema = (prices_array[i] - ema) * multiplier + ema
+            return float(prices[-1])
         
-        return float(ema)
+        return float(_ema_series(prices, period)[-1])
     
-    def calculate_rsi(self, prices: List[float], period: int) -> float:
+    def calculate_rsi(self, prices: np.ndarray, period: int) -> float:
         """
         Calculate Relative Strength Index (RSI)
         
@@ -459,21 +795,16 @@ class MarketAnalyzer:
         if len(prices) <= period:
             return 50  # Default value if not enough data
         
-        prices_array = np.array(prices)
+        prices_array = np.ascontiguousarray(prices, dtype=np.float64)
         deltas = np.diff(prices_array)
         
         # Calculate gains and losses
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
+        gains = np.clip(deltas, 0.0, None)
+        losses = np.clip(-deltas, 0.0, None)
         
-        # Calculate average gain and loss
-        avg_gain = np.mean(gains[:period])
-        avg_loss = np.mean(losses[:period])
-        
-        # Calculate RS values for the remaining periods
-        for i in range(period, len(deltas)):
-            avg_gain = ((avg_gain * (period - 1)) + gains[i]) / period
-            avg_loss = ((avg_loss * (period - 1)) + losses[i]) / period
+        # Calculate average gain and loss with Wilder smoothing
+        avg_gain = _wilder_average(gains, period)
+        avg_loss = _wilder_average(losses, period)
         
         # Calculate RSI
         if avg_loss == 0:
@@ -484,7 +815,8 @@ class MarketAnalyzer:
         
         return float(rsi)
     
-    def calculate_macd(self, prices: List[float], fast_period: int, slow_period: int, signal_period: int) -> Dict[str, float]:
+    def calculate_macd(self, prices: np.ndarray, fast_period: int, slow_period: int, signal_period: int,
+                       fast_series: Optional[np.ndarray] = None, slow_series: Optional[np.ndarray] = None) -> MACDResult:
         """
         Calculate Moving Average Convergence Divergence (MACD)
         
@@ -493,44 +825,52 @@ class MarketAnalyzer:
             fast_period: Fast EMA period
             slow_period: Slow EMA period
             signal_period: Signal EMA period
+            fast_series: Optional precomputed fast EMA series of prices
+            slow_series: Optional precomputed slow EMA series of prices
             
         Returns:
             MACD, signal line, and histogram values
         """
-        if len(prices) < max(fast_period, slow_period) + signal_period:
-            return {
-                "value": 0,
-                "signal": 0,
-                "histogram": 0
-            }
+        # Calculate full fast and slow EMA series once, unless the caller already has them
+        if fast_series is None or slow_series is None:
+            emas = _multi_ema(prices, (fast_period, slow_period))
+            fast_series = emas[fast_period]
+            slow_series = emas[slow_period]
         
-        # Calculate fast and slow EMAs
-        fast_ema = self.calculate_ema(prices, fast_period)
-        slow_ema = self.calculate_ema(prices, slow_period)
+        return self._macd_from_series(fast_series, slow_series, fast_period, slow_period, signal_period)
+    
+    def _macd_from_series(self, fast_series: np.ndarray, slow_series: np.ndarray, fast_period: int, slow_period: int, signal_period: int) -> MACDResult:
+        """
+        Calculate MACD from precomputed fast and slow EMA series
         
-        # Calculate MACD line
-        macd_line = fast_ema - slow_ema
+        Args:
+            fast_series: Fast EMA series
+            slow_series: Slow EMA series
+            fast_period: Fast EMA period
+            slow_period: Slow EMA period
+            signal_period: Signal EMA period
+            
+        Returns:
+            MACD, signal line, and histogram values
+        """
+        if len(fast_series) < max(fast_period, slow_period) + signal_period:
+            return _EMPTY_MACD
         
-        # Generate MACD history for signal line calculation
-        macd_history = []
-        for i in range(slow_period - 1, len(prices)):
-            fast = self.calculate_ema(prices[:i+1], fast_period)
-            slow = self.calculate_ema(prices[:i+1], slow_period)
-            macd_history.append(fast - slow)
+        # MACD history from the point where the slow EMA is seeded
+        macd_history = fast_series[slow_period - 1:] - slow_series[slow_period - 1:]
+        
+        # Calculate MACD line
+        macd_line = macd_history[-1]
         
-        # Calculate signal line
-        signal_line = self.calculate_ema(macd_history, signal_period)
+        # Calculate signal line (the length guard above ensures the history covers the seed)
+        signal_line = _ema_recurrence(macd_history, signal_period, 2 / (signal_period + 1))[-1]
         
         # Calculate histogram
         histogram = macd_line - signal_line
         
-        return {
-            "value": float(macd_line),
-            "signal": float(signal_line),
-            "histogram": float(histogram)
-        }
+        return MACDResult(float(macd_line), float(signal_line), float(histogram))
     
-    def calculate_bollinger_bands(self, prices: List[float], period: int, deviations: int) -> Dict[str, float]:
+    def calculate_bollinger_bands(self, prices: np.ndarray, period: int, deviations: int) -> BBResult:
         """
         Calculate Bollinger Bands
         
@@ -543,31 +883,21 @@ class MarketAnalyzer:
             Upper, middle, and lower band values
         """
         if len(prices) < period:
-            price = prices[-1]
-            return {
-                "upper": price * 1.02,
-                "middle": price,
-                "lower": price * 0.98
-            }
+            price = float(prices[-1])
+            return BBResult(price * 1.02, price, price * 0.98)
         
-        # Calculate the SMA (middle band)
-        recent_prices = prices[-period:]
-        sma = np.mean(recent_prices)
-        
-        # Calculate standard deviation
-        std_dev = np.std(recent_prices)
+        # Calculate the SMA (middle band) and standard deviation of the latest window
+        sma_series, std_series = _rolling_sma_std(prices, period)
+        sma = sma_series[-1]
+        std_dev = std_series[-1]
         
         # Calculate upper and lower bands
         upper_band = sma + (std_dev * deviations)
         lower_band = sma - (std_dev * deviations)
         
-        return {
-            "upper": float(upper_band),
-            "middle": float(sma),
-            "lower": float(lower_band)
-        }
+        return BBResult(float(upper_band), float(sma), float(lower_band))
     
-    def determine_signal(self, price: float, short_ema: float, medium_ema: float, rsi: float, macd: Dict[str, float]) -> str:
+    def determine_signal(self, price: float, short_ema: float, medium_ema: float, rsi: float, macd: MACDResult) -> str:
         """
         Determine overall trading signal based on technical indicators
         
@@ -581,32 +911,21 @@ class MarketAnalyzer:
         Returns:
             Trading signal (buy, sell, neutral)
         """
-        bullish_signals = 0
-        bearish_signals = 0
-        
-        # EMA crossover
-        if short_ema > medium_ema:
-            bullish_signals += 1
-        elif short_ema < medium_ema:
-            bearish_signals += 1
-        
-        # RSI
-        if rsi < self.indicators["rsi"]["oversold"]:
-            bullish_signals += 1
-        elif rsi > self.indicators["rsi"]["overbought"]:
-            bearish_signals += 1
-        
-        # MACD
-        if macd["histogram"] > 0:
-            bullish_signals += 1
-        elif macd["histogram"] < 0:
-            bearish_signals += 1
-        
-        # Price relative to EMAs
-        if price > short_ema and price > medium_ema:
-            bullish_signals += 1
-        elif price < short_ema and price < medium_ema:
-            bearish_signals += 1
+        rsi_config = self.indicators["rsi"]
+        
+        # Count agreeing indicators: EMA crossover, RSI, MACD histogram, price relative to EMAs
+        bullish_signals = (
+            (short_ema > medium_ema)
+            + (rsi < rsi_config["oversold"])
+            + (macd.histogram > 0)
+            + (price > short_ema and price > medium_ema)
+        )
+        bearish_signals = (
+            (short_ema < medium_ema)
+            + (rsi > rsi_config["overbought"])
+            + (macd.histogram < 0)
+            + (price < short_ema and price < medium_ema)
+        )
         
         # Determine overall signal
         if bullish_signals > bearish_signals and bullish_signals >= 3:
@@ -2,18 +2,298 @@
 Strategy Manager module for Crypto Trading Bot
 Implements various trading strategies for different market regimes
 """
-import uuid
+import os
+import sys
 import time
+import secrets
 import json
+import hashlib
+import itertools
 import logging
+import threading
+import multiprocessing
 import numpy as np
-from typing import Dict, List, Optional, Any, Union, Tuple, Type
-from datetime import datetime, timedelta
+from numpy.lib.stride_tricks import sliding_window_view
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple, Union
+from datetime import datetime, timedelta, timezone
 from abc import ABC, abstractmethod
+from cachetools import LRUCache
+from utils.jit import njit
+from utils.helpers import calculate_drawdown, iso_to_datetime
+from services.market_analyzer import _ema_series, _rsi_series
+
+# Signal actions and strategy types, interned once so comparisons can short-circuit on identity
+BUY = sys.intern("buy")
+SELL = sys.intern("sell")
+TREND = sys.intern("trend")
+MEAN_REVERSION = sys.intern("mean_reversion")
+MARKET_MAKING = sys.intern("market_making")
+ARBITRAGE = sys.intern("arbitrage")
+
+# Shared generator for simulated prices
+_RNG = np.random.default_rng()
+
+@lru_cache(maxsize=256)
+def _optimized_params(type_str: str, volatility_bucket: int, trend_bucket: int,
+                      short_ema: Optional[int], long_ema: Optional[int],
+                      order_size: Any) -> Optional[Tuple[Tuple[str, Any], ...]]:
+    """
+    Parameter adjustments for a strategy type in a volatility/trend band
+    
+    Args:
+        type_str: Strategy type
+        volatility_bucket: 0 (<= 1%), 1 (<= 3%) or 2 (> 3%)
+        trend_bucket: 1 if trend strength is above 70, else 0
+        short_ema: Base short EMA period (trend)
+        long_ema: Base long EMA period (trend)
+        order_size: Base order size (market making)
+        
+    Returns:
+        Adjusted parameters as (name, value) pairs, or None to keep the base parameters
+    """
+    if type_str == TREND:
+        if volatility_bucket == 2:
+            # Higher volatility = shorter periods to react faster
+            return (("short_ema", max(5, short_ema - 2)), ("long_ema", max(15, long_ema - 5)))
+        elif trend_bucket:
+            # Strong trend = longer periods to avoid noise
+            return (("short_ema", short_ema + 1), ("long_ema", long_ema + 2))
+        return None
+    
+    elif type_str == MEAN_REVERSION:
+        # Adjust grid width and levels based on volatility
+        return (("width", (1.5, 2.0, 3.0)[volatility_bucket]), ("levels", (12, 10, 6)[volatility_bucket]))
+    
+    elif type_str == MARKET_MAKING:
+        # Adjust spread based on volatility
+        return (("spread", (0.3, 0.5, 0.8)[volatility_bucket]), ("order_size", order_size))
+    
+    return None
+
+@njit("int64(float64[::1], float64, float64)", cache=True)
+def _grid_scan(grid_prices: np.ndarray, price: float, tolerance: float) -> int:
+    """
+    Find the first grid level within a relative tolerance of the price
+    
+    Args:
+        grid_prices: Contiguous float64 array of grid level prices
+        price: Current price
+        tolerance: Relative distance to count as a hit (e.g. 0.001 for 0.1%)
+        
+    Returns:
+        Index of the first matching level, or -1 if none
+    """
+    for i in range(grid_prices.shape[0]):
+        if abs(grid_prices[i] - price) / grid_prices[i] < tolerance:
+            return i
+    return -1
+
+@njit("int8[::1](float64[::1], float64[::1], float64[::1])", cache=True)
+def _trend_signal_kernel(prices: np.ndarray, short_ema: np.ndarray, long_ema: np.ndarray) -> np.ndarray:
+    """
+    EMA crossover signals over a price series, starting from a neutral trend state
+    
+    Args:
+        prices: Price per bar
+        short_ema: Short EMA per bar
+        long_ema: Long EMA per bar
+        
+    Returns:
+        1 (buy), -1 (sell) or 0 (no signal) per bar
+    """
+    signals = np.zeros(prices.shape[0], dtype=np.int8)
+    last_state = 0
+    
+    for i in range(prices.shape[0]):
+        if short_ema[i] > long_ema[i] and prices[i] > short_ema[i]:
+            state = 1
+        elif short_ema[i] < long_ema[i] and prices[i] < short_ema[i]:
+            state = -1
+        else:
+            continue
+        
+        # Only signal when the trend flips
+        if state != last_state:
+            signals[i] = state
+            last_state = state
+    
+    return signals
+
+@njit("int8[::1](float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], int8[::1], float64)", cache=True)
+def _meanrev_signal_kernel(prices: np.ndarray, rsi: np.ndarray, bb_upper: np.ndarray, bb_lower: np.ndarray,
+                           grid_prices: np.ndarray, grid_sides: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Grid and RSI/Bollinger signals over a price series for a fixed grid
+    
+    Args:
+        prices: Price per bar
+        rsi: RSI per bar
+        bb_upper: Upper Bollinger Band per bar
+        bb_lower: Lower Bollinger Band per bar
+        grid_prices: Grid level prices
+        grid_sides: 1 (buy) or -1 (sell) per grid level
+        tolerance: Relative distance to count as a grid hit
+        
+    Returns:
+        1 (buy), -1 (sell) or 0 (no signal) per bar
+    """
+    signals = np.zeros(prices.shape[0], dtype=np.int8)
+    
+    if grid_prices.shape[0] == 0:
+        return signals
+    
+    for i in range(prices.shape[0]):
+        hit = _grid_scan(grid_prices, prices[i], tolerance)
+        if hit >= 0:
+            signals[i] = grid_sides[hit]
+        elif rsi[i] < 30 and prices[i] < bb_lower[i]:
+            signals[i] = 1
+        elif rsi[i] > 70 and prices[i] > bb_upper[i]:
+            signals[i] = -1
+    
+    return signals
+
+def _bollinger_vec(prices: np.ndarray, period: int, deviations: float):
+    """
+    Bollinger Bands at every bar, over zero-copy sliding windows
+    
+    Args:
+        prices: Price per bar
+        period: SMA period
+        deviations: Number of standard deviations
+        
+    Returns:
+        Tuple of (upper, middle, lower) per bar (±2% of the price before the first full window)
+    """
+    upper = prices * 1.02
+    middle = prices.copy()
+    lower = prices * 0.98
+    if prices.shape[0] < period:
+        return upper, middle, lower
+    
+    windows = sliding_window_view(prices, period)
+    sma = windows.mean(axis=1)
+    std_dev = windows.std(axis=1)
+    
+    middle[period - 1:] = sma
+    upper[period - 1:] = sma + std_dev * deviations
+    lower[period - 1:] = sma - std_dev * deviations
+    
+    return upper, middle, lower
+
+@njit(
+    "Tuple((int64[::1], int8[::1], float64[::1], float64[::1], float64[::1], int8[::1], float64))"
+    "(float64[::1], int64[::1], int64[::1], float64, float64, float64, float64)",
+    cache=True
+)
+def _simulate_backtest(prices: np.ndarray, buy_bars: np.ndarray, sell_bars: np.ndarray, capital: float,
+                       position_pct: float, stop_loss_pct: float, take_profit_pct: float):
+    """
+    Walk the backtest signal events with a single position, applying stop loss and take profit
+    
+    Only bars with a buy or sell signal are visited; while in a position, the first stop loss or
+    take profit hit before the next sell signal is found with one vectorized scan.
+    
+    Args:
+        prices: Price per simulated bar
+        buy_bars: Sorted indexes of bars with a buy signal
+        sell_bars: Sorted indexes of bars with a sell signal
+        capital: Initial capital
+        position_pct: Share of capital put into each position (%)
+        stop_loss_pct: Stop loss distance from entry (%)
+        take_profit_pct: Take profit distance from entry (%)
+        
+    Returns:
+        Tuple of per-trade arrays (bar index, side 1/-1, quantity, value, profit/loss,
+        exit flag 0/1 stop loss/2 take profit) and the final capital
+    """
+    n = prices.shape[0]
+    size = 2 * buy_bars.shape[0]
+    bars = np.empty(size, dtype=np.int64)
+    sides = np.empty(size, dtype=np.int8)
+    quantities = np.empty(size, dtype=np.float64)
+    values = np.empty(size, dtype=np.float64)
+    profit_losses = np.empty(size, dtype=np.float64)
+    exits = np.empty(size, dtype=np.int8)
+    
+    count = 0
+    b = 0
+    s = 0
+    first_bar = 0
+    
+    # Exit levels are these multiples of the entry price
+    stop_factor = 1 - stop_loss_pct / 100
+    take_profit_factor = 1 + take_profit_pct / 100
+    
+    while True:
+        # Next buy signal once out of position
+        while b < buy_bars.shape[0] and buy_bars[b] < first_bar:
+            b += 1
+        if b == buy_bars.shape[0]:
+            break
+        
+        entry = buy_bars[b]
+        entry_price = prices[entry]
+        
+        # Calculate quantity based on position size
+        position_size = capital * (position_pct / 100)
+        entry_quantity = position_size / entry_price
+        
+        bars[count] = entry
+        sides[count] = 1
+        quantities[count] = entry_quantity
+        values[count] = position_size
+        profit_losses[count] = 0.0
+        exits[count] = 0
+        count += 1
+        capital -= position_size
+        
+        # Next sell signal after the entry (or the end of the series)
+        while s < sell_bars.shape[0] and sell_bars[s] <= entry:
+            s += 1
+        sell_bar = sell_bars[s] if s < sell_bars.shape[0] else n
+        
+        # First stop loss / take profit hit from the entry bar up to the sell signal
+        stop_level = entry_price * stop_factor
+        take_profit_level = entry_price * take_profit_factor
+        window = prices[entry:sell_bar]
+        hits = (window <= stop_level) | (window >= take_profit_level)
+        
+        if hits.any():
+            exit_bar = entry + np.argmax(hits)
+            exit_flag = 1 if prices[exit_bar] <= stop_level else 2
+        elif sell_bar < n:
+            exit_bar = sell_bar
+            exit_flag = 0
+        else:
+            # Close the open position at the last price
+            exit_bar = n - 1
+            exit_flag = 0
+        
+        exit_value = entry_quantity * prices[exit_bar]
+        
+        bars[count] = exit_bar
+        sides[count] = -1
+        quantities[count] = entry_quantity
+        values[count] = exit_value
+        profit_losses[count] = exit_value - (entry_quantity * entry_price)
+        exits[count] = exit_flag
+        count += 1
+        capital += exit_value
+        
+        first_bar = exit_bar + 1
+    
+    return (bars[:count].copy(), sides[:count].copy(), quantities[:count].copy(), values[:count].copy(),
+            profit_losses[:count].copy(), exits[:count].copy(), capital)
 
 class Strategy(ABC):
     """Abstract base class for all trading strategies"""
     
+    __slots__ = ("name", "parameters", "risk_settings")
+    
     def __init__(self, name: str, parameters: Dict[str, Any]):
         """
         Initialize the strategy
@@ -55,6 +335,50 @@ class Strategy(ABC):
         """
         pass
     
+    def backtest_signals(self, symbol: str, prices: np.ndarray, indicators: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Get the signal for every bar of a backtest
+        
+        Args:
+            symbol: Cryptocurrency symbol
+            prices: Contiguous float64 array with the price per bar
+            indicators: Indicator series aligned with prices (see StrategyManager.backtest_indicators)
+            
+        Returns:
+            int8 array with 1 (buy), -1 (sell) or 0 (no signal) per bar
+        """
+        signals = np.zeros(prices.shape[0], dtype=np.int8)
+        series = {name: values.tolist() for name, values in indicators.items()}
+        
+        for i, price in enumerate(prices.tolist()):
+            technicals = {
+                "symbol": symbol,
+                "price": price,
+                "ema": {
+                    "short": series["ema_short"][i],
+                    "medium": series["ema_medium"][i],
+                    "long": series["ema_long"][i]
+                },
+                "rsi": series["rsi"][i],
+                "macd": {
+                    "value": series["macd"][i],
+                    "signal": series["macd_signal"][i],
+                    "histogram": series["macd_histogram"][i]
+                },
+                "bollinger": {
+                    "upper": series["bb_upper"][i],
+                    "middle": series["bb_middle"][i],
+                    "lower": series["bb_lower"][i]
+                },
+                "signal": "neutral"
+            }
+            
+            signal = self.get_signal(price, technicals)
+            if signal:
+                signals[i] = 1 if signal["action"] == BUY else -1
+        
+        return signals
+    
     def calculate_position_size(self, price: float, capital: float) -> float:
         """
         Calculate position size based on risk settings
@@ -74,8 +398,13 @@ class TrendFollowingStrategy(Strategy):
     """
     Trend Following Strategy
     Uses EMA crossovers to identify and follow trends
+    
+    Signals use the market analyzer's short and medium EMAs (backtests: ema_short/ema_medium),
+    so the short_ema and long_ema parameters are stored but don't change the signals.
     """
     
+    __slots__ = ("_last_state",)
+    
     def __init__(self, name: str, parameters: Dict[str, Any]):
         """Initialize with default parameters if not provided"""
         default_params = {
@@ -85,6 +414,9 @@ class TrendFollowingStrategy(Strategy):
         # Update defaults with provided parameters
         default_params.update(parameters)
         super().__init__(name, default_params)
+        
+        # Last trend state per symbol (1 bullish, -1 bearish, 0 neither) to signal only on crossovers
+        self._last_state: Dict[str, int] = {}
     
     def get_signal(self, price: float, technicals: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -98,39 +430,73 @@ class TrendFollowingStrategy(Strategy):
             Trading signal or None if no signal
         """
         # Check if we have the necessary data
-        if not technicals or "ema" not in technicals:
+        if technicals is None:
+            return None
+        
+        ema = technicals.get("ema")
+        symbol = technicals.get("symbol")
+        if ema is None or symbol is None:
             return None
         
         # Get EMA values
-        short_ema = technicals["ema"]["short"]
-        long_ema = technicals["ema"]["medium"]
+        short_ema, long_ema = ema["short"], ema["medium"]
         
-        # Check for buy signal: short EMA crosses above long EMA
         if short_ema > long_ema and price > short_ema:
+            state = 1
+        elif short_ema < long_ema and price < short_ema:
+            state = -1
+        else:
+            state = 0
+        
+        # Only signal when the trend flips, not on every tick it holds
+        if state == 0 or state == self.last_state(symbol):
+            return None
+        
+        return self.flip(symbol, price, state)
+    
+    def last_state(self, symbol: str) -> int:
+        """Last trend state of a symbol (1 bullish, -1 bearish, 0 neither)"""
+        return self._last_state.get(symbol, 0)
+    
+    def flip(self, symbol: str, price: float, state: int) -> Dict[str, Any]:
+        """
+        Record a trend flip and build its signal
+        
+        Args:
+            symbol: Cryptocurrency symbol
+            price: Current price
+            state: New trend state (1 bullish, -1 bearish)
+            
+        Returns:
+            Trading signal
+        """
+        self._last_state[symbol] = state
+        
+        # Check for buy signal: short EMA crosses above long EMA
+        if state == 1:
             # Buy signal
             return {
-                "action": "buy",
-                "symbol": technicals["symbol"],
+                "action": BUY,
+                "symbol": symbol,
                 "price": price,
                 "quantity": 1,  # This would be calculated based on risk management
                 "reason": "EMA crossover (bullish)",
-                "timestamp": datetime.now().isoformat()
-            }
-        
-        # Check for sell signal: short EMA crosses below long EMA
-        if short_ema < long_ema and price < short_ema:
-            # Sell signal
-            return {
-                "action": "sell",
-                "symbol": technicals["symbol"],
-                "price": price,
-                "quantity": 1,  # This would be based on current position
-                "reason": "EMA crossover (bearish)",
-                "timestamp": datetime.now().isoformat()
+                "timestamp_ns": time.time_ns()
             }
         
-        # No signal
-        return None
+        # Sell signal: short EMA crosses below long EMA
+        return {
+            "action": SELL,
+            "symbol": symbol,
+            "price": price,
+            "quantity": 1,  # This would be based on current position
+            "reason": "EMA crossover (bearish)",
+            "timestamp_ns": time.time_ns()
+        }
+    
+    def backtest_signals(self, symbol: str, prices: np.ndarray, indicators: Dict[str, np.ndarray]) -> np.ndarray:
+        """Crossover signals for every bar of a backtest, computed in one compiled pass"""
+        return _trend_signal_kernel(prices, indicators["ema_short"], indicators["ema_medium"])
 
 
 class MeanReversionStrategy(Strategy):
@@ -139,6 +505,8 @@ class MeanReversionStrategy(Strategy):
     Uses grid trading to buy low and sell high in sideways markets
     """
     
+    __slots__ = ("_grid_prices", "_grid_actions", "_grid_sides", "_grid_idx", "_grid_templates")
+    
     def __init__(self, name: str, parameters: Dict[str, Any]):
         """Initialize with default parameters if not provided"""
         default_params = {
@@ -149,7 +517,14 @@ class MeanReversionStrategy(Strategy):
         default_params.update(parameters)
         super().__init__(name, default_params)
         
-        self.grid_levels = {}  # To track grid levels for different symbols
+        # Grid levels per symbol as parallel arrays for the per-tick proximity scan
+        self._grid_prices = {}
+        self._grid_actions = {}
+        self._grid_sides = {}
+        self._grid_idx = {}
+        
+        # Invariant part of the signal fired at each grid level, per symbol
+        self._grid_templates = {}
     
     def get_signal(self, price: float, technicals: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -163,55 +538,52 @@ class MeanReversionStrategy(Strategy):
             Trading signal or None if no signal
         """
         # Check if we have the necessary data
-        if not technicals or "bollinger" not in technicals:
+        if technicals is None:
             return None
         
-        symbol = technicals["symbol"]
-        bollinger = technicals["bollinger"]
+        bollinger = technicals.get("bollinger")
+        symbol = technicals.get("symbol")
+        if bollinger is None or symbol is None:
+            return None
         
-        # Calculate grid levels if not already set
-        if symbol not in self.grid_levels:
-            self.calculate_grid_levels(symbol, bollinger["middle"], bollinger["upper"], bollinger["lower"])
+        bb_upper, bb_lower, bb_middle = bollinger["upper"], bollinger["lower"], bollinger["middle"]
         
-        # Get grid levels for this symbol
-        grid_levels = self.grid_levels.get(symbol, [])
+        # Calculate grid levels if not already set
+        grid_prices = self._grid_prices.get(symbol)
+        if grid_prices is None:
+            self.calculate_grid_levels(symbol, bb_middle, bb_upper, bb_lower)
+            grid_prices = self._grid_prices[symbol]
         
-        if not grid_levels:
+        if not grid_prices.size:
             return None
         
-        # Check if price crosses a grid level
-        for level in grid_levels:
-            if abs(price - level["price"]) / level["price"] < 0.001:  # Within 0.1% of the level
-                return {
-                    "action": level["action"],
-                    "symbol": technicals["symbol"],
-                    "price": price,
-                    "quantity": 1,  # This would be calculated based on risk management
-                    "reason": f"Grid level {level['level']} ({level['action']})",
-                    "timestamp": datetime.now().isoformat()
-                }
+        # Check if price crosses a grid level (within 0.1% of the level)
+        hit = _grid_scan(grid_prices, float(price), 0.001)
+        if hit >= 0:
+            return {**self._grid_templates[symbol][hit], "price": price, "timestamp_ns": time.time_ns()}
         
         # Check for oversold/overbought conditions for additional signals
-        if technicals.get("rsi", 50) < 30 and price < bollinger["lower"]:
+        rsi = technicals.get("rsi", 50)
+        if rsi < 30 and price < bb_lower:
             # Oversold condition, buy signal
             return {
-                "action": "buy",
-                "symbol": technicals["symbol"],
+                "action": BUY,
+                "symbol": symbol,
                 "price": price,
                 "quantity": 1,  # This would be calculated based on risk management
                 "reason": "Oversold condition (RSI + Bollinger)",
-                "timestamp": datetime.now().isoformat()
+                "timestamp_ns": time.time_ns()
             }
         
-        if technicals.get("rsi", 50) > 70 and price > bollinger["upper"]:
+        if rsi > 70 and price > bb_upper:
             # Overbought condition, sell signal
             return {
-                "action": "sell",
-                "symbol": technicals["symbol"],
+                "action": SELL,
+                "symbol": symbol,
                 "price": price,
                 "quantity": 1,  # This would be based on current position
                 "reason": "Overbought condition (RSI + Bollinger)",
-                "timestamp": datetime.now().isoformat()
+                "timestamp_ns": time.time_ns()
             }
         
         # No signal
@@ -227,32 +599,57 @@ class MeanReversionStrategy(Strategy):
             upper: Upper Bollinger Band
             lower: Lower Bollinger Band
         """
-        levels = []
-        
         # Calculate grid width based on Bollinger Bands and parameter
         price_range = upper - lower
         grid_width = price_range / self.parameters["levels"]
         
-        # Create buy levels below middle
-        for i in range(1, int(self.parameters["levels"] / 2) + 1):
-            price = middle - (i * grid_width)
-            levels.append({
-                "level": -i,
-                "price": price,
-                "action": "buy"
-            })
-        
-        # Create sell levels above middle
-        for i in range(1, int(self.parameters["levels"] / 2) + 1):
-            price = middle + (i * grid_width)
-            levels.append({
-                "level": i,
-                "price": price,
-                "action": "sell"
-            })
+        half = int(self.parameters["levels"] / 2)
+        steps = np.arange(1, half + 1)
+        
+        # Buy levels below middle, then sell levels above middle
+        self._grid_prices[symbol] = np.concatenate((middle - steps * grid_width, middle + steps * grid_width))
+        self._grid_actions[symbol] = np.array([BUY] * half + [SELL] * half)
+        self._grid_sides[symbol] = np.repeat(np.array([1, -1], dtype=np.int8), half)
+        self._grid_idx[symbol] = np.concatenate((-steps, steps)).astype(np.int32)
+        self._grid_templates[symbol] = [
+            {
+                "action": action,
+                "symbol": symbol,
+                "quantity": 1,  # This would be calculated based on risk management
+                "reason": f"Grid level {level} ({action})"
+            }
+            for level, action in zip(
+                self._grid_idx[symbol].tolist(), (BUY if side > 0 else SELL for side in self._grid_sides[symbol].tolist())
+            )
+        ]
+    
+    def backtest_signals(self, symbol: str, prices: np.ndarray, indicators: Dict[str, np.ndarray]) -> np.ndarray:
+        """Grid and RSI/Bollinger signals for every bar of a backtest, computed in one compiled pass"""
+        if not prices.size:
+            return np.zeros(0, dtype=np.int8)
+        
+        bb_upper, bb_lower = indicators["bb_upper"], indicators["bb_lower"]
         
-        # Store grid levels
-        self.grid_levels[symbol] = levels
+        # Lay out the grid from the first bar's bands, as get_signal does
+        if symbol not in self._grid_prices:
+            self.calculate_grid_levels(symbol, float(indicators["bb_middle"][0]), float(bb_upper[0]), float(bb_lower[0]))
+        
+        return _meanrev_signal_kernel(
+            prices, indicators["rsi"], bb_upper, bb_lower, self._grid_prices[symbol], self._grid_sides[symbol], 0.001
+        )
+    
+    @property
+    def grid_levels(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Grid levels per symbol as level/price/action dicts, built on demand from the arrays"""
+        return {
+            symbol: [
+                {"level": level, "price": price, "action": action}
+                for level, price, action in zip(
+                    self._grid_idx[symbol].tolist(), prices.tolist(), self._grid_actions[symbol].tolist()
+                )
+            ]
+            for symbol, prices in self._grid_prices.items()
+        }
 
 
 class MarketMakingStrategy(Strategy):
@@ -261,6 +658,8 @@ class MarketMakingStrategy(Strategy):
     Places limit orders on both sides of the market to capture the spread
     """
     
+    __slots__ = ("_spread", "_quotes")
+    
     def __init__(self, name: str, parameters: Dict[str, Any]):
         """Initialize with default parameters if not provided"""
         default_params = {
@@ -270,6 +669,10 @@ class MarketMakingStrategy(Strategy):
         # Update defaults with provided parameters
         default_params.update(parameters)
         super().__init__(name, default_params)
+        
+        # Spread as a fraction, and the (bid, ask) quoted per symbol
+        self._spread = default_params["spread"] / 100
+        self._quotes = {}
     
     def get_signal(self, price: float, technicals: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -286,39 +689,49 @@ class MarketMakingStrategy(Strategy):
         # For simplicity, we'll simulate this with market orders based on price movements
         
         # Check if we have the necessary data
-        if not technicals:
+        if technicals is None:
+            return None
+        
+        symbol = technicals.get("symbol")
+        if symbol is None:
             return None
         
-        # Calculate bid and ask prices
-        spread_amount = price * (self.parameters["spread"] / 100)
-        bid_price = price - spread_amount
-        ask_price = price + spread_amount
+        quotes = self._quotes.get(symbol)
         
         # In a real market making strategy, we would place limit orders at these prices
-        # For this simulation, we'll generate signals when price approaches these levels
+        # For this simulation, we quote around the first price seen and re-quote after every fill
+        if quotes is None:
+            self._quotes[symbol] = (price * (1 - self._spread), price * (1 + self._spread))
+            return None
+        
+        bid_price, ask_price = quotes
         
-        # Check if price is near our bid price
-        if abs(price - bid_price) / price < 0.001:
+        # Check if price reached (or came within 0.1% of) our bid price
+        if price <= bid_price * 1.001:
+            self._quotes[symbol] = (price * (1 - self._spread), price * (1 + self._spread))
+            
             # Buy signal
             return {
-                "action": "buy",
-                "symbol": technicals["symbol"],
+                "action": BUY,
+                "symbol": symbol,
                 "price": price,
                 "quantity": 1,  # This would be calculated based on risk management
                 "reason": "Market making bid",
-                "timestamp": datetime.now().isoformat()
+                "timestamp_ns": time.time_ns()
             }
         
-        # Check if price is near our ask price
-        if abs(price - ask_price) / price < 0.001:
+        # Check if price reached (or came within 0.1% of) our ask price
+        if price >= ask_price * 0.999:
+            self._quotes[symbol] = (price * (1 - self._spread), price * (1 + self._spread))
+            
             # Sell signal
             return {
-                "action": "sell",
-                "symbol": technicals["symbol"],
+                "action": SELL,
+                "symbol": symbol,
                 "price": price,
                 "quantity": 1,  # This would be based on current position
                 "reason": "Market making ask",
-                "timestamp": datetime.now().isoformat()
+                "timestamp_ns": time.time_ns()
             }
         
         # No signal
@@ -331,6 +744,8 @@ class ArbitrageStrategy(Strategy):
     Exploits price differences between different exchanges
     """
     
+    __slots__ = ("_uniforms", "_uniform_idx")
+    
     def __init__(self, name: str, parameters: Dict[str, Any]):
         """Initialize with default parameters if not provided"""
         default_params = {
@@ -339,6 +754,10 @@ class ArbitrageStrategy(Strategy):
         # Update defaults with provided parameters
         default_params.update(parameters)
         super().__init__(name, default_params)
+        
+        # Batch of uniform draws for the simulated price, refilled when used up
+        self._uniforms = _RNG.random(4096)
+        self._uniform_idx = 0
     
     def get_signal(self, price: float, technicals: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -355,46 +774,114 @@ class ArbitrageStrategy(Strategy):
         # For simplicity, we'll simulate this with a random price difference
         
         # Check if we have the necessary data
-        if not technicals:
+        if technicals is None:
+            return None
+        
+        symbol = technicals.get("symbol")
+        if symbol is None:
             return None
         
         # Simulate price from another exchange
-        import random
-        other_exchange_price = price * (1 + (random.random() * 0.02 - 0.01))  # ±1% difference
+        if self._uniform_idx == self._uniforms.size:
+            self._uniforms = _RNG.random(4096)
+            self._uniform_idx = 0
+        u = float(self._uniforms[self._uniform_idx])
+        self._uniform_idx += 1
+        other_exchange_price = price * (1 + (u * 0.02 - 0.01))  # ±1% difference
         
-        # Calculate percentage difference
-        spread_percentage = abs(other_exchange_price - price) / price * 100
+        # Signed relative difference: positive means the other exchange is higher
+        delta = (other_exchange_price - price) / price
+        spread_percentage = abs(delta) * 100
         
         # Check if spread is large enough for arbitrage
         if spread_percentage >= self.parameters["min_spread"]:
-            if other_exchange_price > price:
-                # Buy on this exchange, sell on the other
-                return {
-                    "action": "buy",
-                    "symbol": technicals["symbol"],
-                    "price": price,
-                    "quantity": 1,  # This would be calculated based on risk management
-                    "reason": f"Arbitrage opportunity ({spread_percentage:.2f}% spread)",
-                    "timestamp": datetime.now().isoformat()
-                }
-            else:
-                # Sell on this exchange, buy on the other
-                return {
-                    "action": "sell",
-                    "symbol": technicals["symbol"],
-                    "price": price,
-                    "quantity": 1,  # This would be based on current position
-                    "reason": f"Arbitrage opportunity ({spread_percentage:.2f}% spread)",
-                    "timestamp": datetime.now().isoformat()
-                }
+            # Buy here and sell there when the other exchange is higher, otherwise the reverse
+            return {
+                "action": BUY if delta > 0 else SELL,
+                "symbol": symbol,
+                "price": price,
+                "quantity": 1,  # This would be calculated based on risk management / current position
+                "reason": f"Arbitrage opportunity ({spread_percentage:.2f}% spread)",
+                "timestamp_ns": time.time_ns()
+            }
         
         # No signal
         return None
 
 
+def _run_backtest(strategy_class: type, type_str: str, parameters: Dict[str, Any], risk_settings: Dict[str, Any],
+                  symbol: str, prices: np.ndarray, indicators: Dict[str, np.ndarray], initial_capital: float):
+    """
+    Run one strategy over prepared backtest data
+    
+    Args:
+        strategy_class: Strategy class to backtest
+        type_str: Strategy type
+        parameters: Strategy parameters
+        risk_settings: Risk management settings
+        symbol: Cryptocurrency symbol
+        prices: Price per simulated bar
+        indicators: Indicator series aligned with prices
+        initial_capital: Initial capital
+        
+    Returns:
+        Per-trade arrays and final capital, as returned by _simulate_backtest
+    """
+    # Create strategy instance and apply risk management
+    strategy = strategy_class(f"Backtest {type_str}", parameters)
+    strategy.set_risk_management(risk_settings)
+    
+    # Signal per simulated bar: 1 buy, -1 sell, 0 none
+    signals = strategy.backtest_signals(symbol, prices, indicators)
+    
+    # Run backtest over the signal events only
+    return _simulate_backtest(
+        prices,
+        np.flatnonzero(signals == 1),
+        np.flatnonzero(signals == -1),
+        float(initial_capital),
+        float(risk_settings["max_position_size"]),
+        float(risk_settings["stop_loss"]),
+        float(risk_settings["take_profit"])
+    )
+
+def _naive_utc(iso_str: str) -> datetime:
+    """Parse an ISO 8601 date as naive UTC (times without an offset are taken to be UTC already)"""
+    dt = iso_to_datetime(iso_str)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+def _sweep_chunk(strategy_class: type, type_str: str, parameter_sets: List[Dict[str, Any]], risk_settings: Dict[str, Any],
+                 symbol: str, prices: np.ndarray, indicators: Dict[str, np.ndarray], initial_capital: float) -> List[tuple]:
+    """Run a slice of a sweep's parameter sets in a worker process (the data is sent once per slice)"""
+    return [
+        _run_backtest(strategy_class, type_str, parameters, risk_settings, symbol, prices, indicators, initial_capital)
+        for parameters in parameter_sets
+    ]
+
 class StrategyManager:
     """Manager for trading strategies and signal generation"""
     
+    # Maximum number of trades kept in memory
+    TRADE_HISTORY_CAP = 100_000
+    
+    # Initial number of (type, symbol) performance slots, doubled when full
+    PERFORMANCE_CAPACITY = 1024
+    
+    # Number of backtest indicator sets kept for reuse across backtests
+    INDICATOR_CACHE_SIZE = 64
+    
+    # Worker processes in the pool shared by all backtest sweeps
+    SWEEP_WORKERS = min(4, os.cpu_count() or 1)
+    
+    __slots__ = (
+        "strategies", "api_service", "market_analyzer", "active_strategies", "_by_symbol",
+        "_perf_index", "_perf_trades", "_perf_wins", "_perf_losses", "_perf_pl", "_perf_return",
+        "risk_settings", "trades", "_trade_session", "_trade_counter", "_indicator_cache", "_indicator_lock",
+        "_sweep_pool", "_sweep_pool_lock", "logger"
+    )
+    
     def __init__(self, api_service, market_analyzer):
         """
         Initialize the strategy manager
@@ -405,21 +892,29 @@ class StrategyManager:
         """
         # Available strategies
         self.strategies = {
-            "trend": TrendFollowingStrategy,
-            "mean_reversion": MeanReversionStrategy,
-            "market_making": MarketMakingStrategy,
-            "arbitrage": ArbitrageStrategy
+            TREND: TrendFollowingStrategy,
+            MEAN_REVERSION: MeanReversionStrategy,
+            MARKET_MAKING: MarketMakingStrategy,
+            ARBITRAGE: ArbitrageStrategy
         }
         
         # API service and market analyzer
         self.api_service = api_service
         self.market_analyzer = market_analyzer
         
-        # Active strategies for different symbols
+        # Active strategies keyed by (type, symbol)
         self.active_strategies = {}
         
-        # Strategy performance metrics
-        self.performance = {}
+        # Strategy used for signals per symbol: (type, strategy), the first one activated
+        self._by_symbol = {}
+        
+        # Strategy performance metrics as parallel arrays, indexed by slot per (type, symbol)
+        self._perf_index: Dict[Tuple[str, str], int] = {}
+        self._perf_trades = np.zeros(self.PERFORMANCE_CAPACITY, dtype=np.int64)
+        self._perf_wins = np.zeros(self.PERFORMANCE_CAPACITY, dtype=np.int64)
+        self._perf_losses = np.zeros(self.PERFORMANCE_CAPACITY, dtype=np.int64)
+        self._perf_pl = np.zeros(self.PERFORMANCE_CAPACITY, dtype=np.float64)
+        self._perf_return = np.zeros(self.PERFORMANCE_CAPACITY, dtype=np.float64)
         
         # Risk management settings
         self.risk_settings = {
@@ -430,8 +925,20 @@ class StrategyManager:
             "emergency_stop_threshold": 15  # % portfolio drawdown
         }
         
-        # Trade history
-        self.trades = []
+        # Trade history (oldest trades are dropped once the cap is reached)
+        self.trades = deque(maxlen=self.TRADE_HISTORY_CAP)
+        
+        # Trade IDs are a per-instance random prefix plus a counter
+        self._trade_session = secrets.token_hex(4)
+        self._trade_counter = itertools.count(1)
+        
+        # Backtest indicator series keyed by a digest of the price series
+        self._indicator_cache = LRUCache(maxsize=self.INDICATOR_CACHE_SIZE)
+        self._indicator_lock = threading.Lock()
+        
+        # Process pool for backtest sweeps, created on first use and reused by every sweep
+        self._sweep_pool = None
+        self._sweep_pool_lock = threading.Lock()
         
         self.logger = logging.getLogger(__name__)
     
@@ -449,7 +956,7 @@ class StrategyManager:
             Success status
         """
         if type_str not in self.strategies:
-            self.logger.error(f"Strategy type {type_str} not found")
+            self.logger.error("Strategy type %s not found", type_str)
             return False
         
         try:
@@ -461,23 +968,22 @@ class StrategyManager:
             
             # Activate for each symbol
             for symbol in symbols:
-                key = f"{type_str}_{symbol}"
-                self.active_strategies[key] = strategy
+                self.active_strategies[(type_str, symbol)] = strategy
+                
+                entry = self._by_symbol.get(symbol)
+                if entry is None or entry[0] == type_str:
+                    self._by_symbol[symbol] = (type_str, strategy)
                 
                 # Initialize performance tracking
-                self.performance[key] = {
-                    "trades": 0,
-                    "wins": 0,
-                    "losses": 0,
-                    "profit_loss": 0,
-                    "return": 0
-                }
+                i = self._perf_slot((type_str, symbol))
+                self._perf_trades[i] = self._perf_wins[i] = self._perf_losses[i] = 0
+                self._perf_pl[i] = self._perf_return[i] = 0.0
             
-            self.logger.info(f"Strategy {name} activated for {', '.join(symbols)}")
+            self.logger.info("Strategy %s activated for %s", name, ', '.join(symbols))
             return True
         
         except Exception as e:
-            self.logger.error(f"Failed to activate strategy {name}: {str(e)}")
+            self.logger.error("Failed to activate strategy %s: %s", name, e)
             return False
     
     def deactivate_strategy(self, type_str: str, symbols: List[str]) -> bool:
@@ -493,14 +999,22 @@ class StrategyManager:
         """
         try:
             for symbol in symbols:
-                key = f"{type_str}_{symbol}"
-                if key in self.active_strategies:
-                    del self.active_strategies[key]
+                if self.active_strategies.pop((type_str, symbol), None) is None:
+                    continue
+                
+                entry = self._by_symbol.get(symbol)
+                if entry is not None and entry[0] == type_str:
+                    # Fall back to the next active strategy for this symbol, if any
+                    del self._by_symbol[symbol]
+                    for (other_type, sym), strategy in self.active_strategies.items():
+                        if sym == symbol:
+                            self._by_symbol[symbol] = (other_type, strategy)
+                            break
             
             return True
         
         except Exception as e:
-            self.logger.error(f"Failed to deactivate strategy for {', '.join(symbols)}: {str(e)}")
+            self.logger.error("Failed to deactivate strategy for %s: %s", ', '.join(symbols), e)
             return False
     
     async def get_optimal_strategy(self, symbol: str) -> Dict[str, Any]:
@@ -536,12 +1050,12 @@ class StrategyManager:
             }
         
         except Exception as e:
-            self.logger.error(f"Failed to get optimal strategy for {symbol}: {str(e)}")
+            self.logger.error("Failed to get optimal strategy for %s: %s", symbol, e)
             
             # Return default strategy
             return {
                 "name": "Conservative Trend Following",
-                "type": "trend",
+                "type": TREND,
                 "parameters": {
                     "short_ema": 9,
                     "long_ema": 21
@@ -564,59 +1078,21 @@ class StrategyManager:
         """
         volatility = market_analysis["volatility"]
         trend_strength = market_analysis["trend_strength"]
-        regime = market_analysis["regime"]
-        
-        if type_str == "trend":
-            # Adjust EMA periods based on volatility and trend strength
-            if volatility > 0.03:
-                # Higher volatility = shorter periods to react faster
-                return {
-                    "short_ema": max(5, base_params["short_ema"] - 2),
-                    "long_ema": max(15, base_params["long_ema"] - 5)
-                }
-            elif trend_strength > 70:
-                # Strong trend = longer periods to avoid noise
-                return {
-                    "short_ema": base_params["short_ema"] + 1,
-                    "long_ema": base_params["long_ema"] + 2
-                }
-            else:
-                return base_params
-        
-        elif type_str == "mean_reversion":
-            # Adjust grid width and levels based on volatility
-            width = 1.5
-            if volatility > 0.03:
-                width = 3.0
-            elif volatility > 0.01:
-                width = 2.0
-            
-            levels = 12
-            if volatility > 0.03:
-                levels = 6
-            elif volatility > 0.01:
-                levels = 10
-            
-            return {
-                "width": width,
-                "levels": levels
-            }
         
-        elif type_str == "market_making":
-            # Adjust spread based on volatility
-            spread = 0.3
-            if volatility > 0.03:
-                spread = 0.8
-            elif volatility > 0.01:
-                spread = 0.5
-            
-            return {
-                "spread": spread,
-                "order_size": base_params.get("order_size", 5)
-            }
+        # The adjustments only depend on which threshold band the inputs fall in
+        volatility_bucket = 2 if volatility > 0.03 else 1 if volatility > 0.01 else 0
+        trend_bucket = 1 if trend_strength > 70 else 0
         
-        else:
-            return base_params
+        params = _optimized_params(
+            type_str,
+            volatility_bucket,
+            trend_bucket,
+            base_params.get("short_ema"),
+            base_params.get("long_ema"),
+            base_params.get("order_size", 5)
+        )
+        
+        return base_params if params is None else dict(params)
     
     async def get_signal(self, symbol: str, price: float) -> Optional[Dict[str, Any]]:
         """
@@ -631,15 +1107,7 @@ class StrategyManager:
         """
         try:
             # Check if we have an active strategy for this symbol
-            active_strategy = None
-            strategy_type = None
-            
-            for key, strategy in self.active_strategies.items():
-                type_str, sym = key.split('_')
-                if sym == symbol:
-                    active_strategy = strategy
-                    strategy_type = type_str
-                    break
+            strategy_type, active_strategy = self._by_symbol.get(symbol, (None, None))
             
             # If no active strategy, get optimal strategy
             if not active_strategy:
@@ -654,9 +1122,7 @@ class StrategyManager:
                 )
                 
                 # Get the newly activated strategy
-                key = f"{optimal['type']}_{symbol}"
-                active_strategy = self.active_strategies.get(key)
-                strategy_type = optimal["type"]
+                strategy_type, active_strategy = self._by_symbol.get(symbol, (None, None))
             
             # Get technical analysis
             technicals = self.market_analyzer.analyze_technicals(symbol)
@@ -665,9 +1131,76 @@ class StrategyManager:
             return active_strategy.get_signal(price, technicals) if active_strategy else None
         
         except Exception as e:
-            self.logger.error(f"Failed to get signal for {symbol}: {str(e)}")
+            self.logger.error("Failed to get signal for %s: %s", symbol, e)
             return None
     
+    async def get_signals_batch(self, prices: Dict[str, float]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get trading signals for several symbols at once
+        
+        Trend following symbols are evaluated together: their EMAs are collected into arrays,
+        the trend state and crossover flips come from vectorized comparisons, and signal dicts
+        are only built for the rows that flip. Other strategy types keep the per-symbol path.
+        
+        Args:
+            prices: Current price keyed by symbol
+            
+        Returns:
+            Trading signals keyed by symbol (symbols without a signal are omitted)
+        """
+        signals = {}
+        trend_symbols = []
+        trend_strategies = []
+        price_list = []
+        short_list = []
+        medium_list = []
+        last_list = []
+        
+        for symbol, price in prices.items():
+            strategy = self._by_symbol.get(symbol, (None, None))[1]
+            
+            if not isinstance(strategy, TrendFollowingStrategy):
+                signal = await self.get_signal(symbol, price)
+                if signal:
+                    signals[symbol] = signal
+                continue
+            
+            # One pass over the (normally cached) technicals, straight into the columns
+            try:
+                ema = self.market_analyzer.analyze_technicals(symbol)["ema"]
+                short_ema, medium_ema = float(ema["short"]), float(ema["medium"])
+                price = float(price)
+            except Exception as e:
+                self.logger.error("Failed to get signal for %s: %s", symbol, e)
+                continue
+            
+            trend_symbols.append(symbol)
+            trend_strategies.append(strategy)
+            price_list.append(price)
+            short_list.append(short_ema)
+            medium_list.append(medium_ema)
+            last_list.append(strategy.last_state(symbol))
+        
+        if trend_symbols:
+            price_arr = np.array(price_list)
+            short_ema = np.array(short_list)
+            long_ema = np.array(medium_list)
+            
+            # Trend state per row (1 bullish, -1 bearish, 0 neither), as TrendFollowingStrategy.get_signal
+            state = np.where((short_ema > long_ema) & (price_arr > short_ema), 1, 0)
+            state[(short_ema < long_ema) & (price_arr < short_ema)] = -1
+            
+            # Only rows whose state flips signal (and update the strategy's crossover state)
+            flips = np.flatnonzero((state != 0) & (state != np.array(last_list)))
+            for i, new_state in zip(flips.tolist(), state[flips].tolist()):
+                symbol = trend_symbols[i]
+                try:
+                    signals[symbol] = trend_strategies[i].flip(symbol, price_list[i], new_state)
+                except Exception as e:
+                    self.logger.error("Failed to get signal for %s: %s", symbol, e)
+        
+        return signals
+    
     async def execute_signal(self, signal: Dict[str, Any], simulation: bool = True) -> Dict[str, Any]:
         """
         Execute a trading signal
@@ -680,23 +1213,24 @@ class StrategyManager:
             Trade execution result
         """
         try:
+            trade_id = self.generate_trade_id()
             result = {
                 "success": True,
                 "simulation": simulation,
-                "trade_id": self.generate_trade_id(),
+                "trade_id": trade_id,
                 "symbol": signal["symbol"],
                 "action": signal["action"],
                 "price": signal["price"],
                 "quantity": signal["quantity"],
-                "timestamp": datetime.now().isoformat()
+                "timestamp_ns": time.time_ns()
             }
             
             if simulation:
                 # In simulation mode, just log the trade
-                self.logger.info(f"SIMULATION: {signal['action']} {signal['symbol']} @ {signal['price']}")
+                self.logger.info("SIMULATION: %s %s @ %s", signal['action'], signal['symbol'], signal['price'])
                 
                 # Update performance metrics
-                self.update_performance(signal["symbol"], signal["action"], signal)
+                self.update_performance(signal["symbol"], signal["action"], signal, trade_id=trade_id)
                 
                 return result
             else:
@@ -709,18 +1243,19 @@ class StrategyManager:
                 )
                 
                 # Update performance metrics
-                self.update_performance(signal["symbol"], signal["action"], signal)
+                self.update_performance(signal["symbol"], signal["action"], signal, trade_id=trade_id)
                 
                 return {**result, **trade_result}
         
         except Exception as e:
-            self.logger.error(f"Failed to execute signal: {str(e)}")
+            self.logger.error("Failed to execute signal: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
     
-    def update_performance(self, symbol: str, action: str, signal: Dict[str, Any]):
+    def update_performance(self, symbol: str, action: str, signal: Dict[str, Any],
+                           trade_id: Optional[str] = None):
         """
         Update strategy performance metrics
         
@@ -728,54 +1263,39 @@ class StrategyManager:
             symbol: Cryptocurrency symbol
             action: Trade action (buy, sell)
             signal: Trading signal
+            trade_id: ID of the executed trade (a new one is generated if omitted)
         """
         # Find the strategy for this symbol
-        strategy_type = None
-        
-        for key in self.active_strategies:
-            type_str, sym = key.split('_')
-            if sym == symbol:
-                strategy_type = type_str
-                break
+        strategy_type = self._by_symbol.get(symbol, (None, None))[0]
         
         if not strategy_type:
             return
         
-        key = f"{strategy_type}_{symbol}"
-        
         # Update performance metrics
-        metrics = self.performance.get(key, {
-            "trades": 0,
-            "wins": 0,
-            "losses": 0,
-            "profit_loss": 0,
-            "return": 0
-        })
-        
-        metrics["trades"] += 1
+        i = self._perf_slot((strategy_type, symbol))
+        self._perf_trades[i] += 1
         
         # For simplicity, we'll assume each sell action completes a trade cycle
-        if action == "sell" and "profit_loss" in signal:
-            if signal["profit_loss"] > 0:
-                metrics["wins"] += 1
+        if action == SELL and "profit_loss" in signal:
+            profit_loss = signal["profit_loss"]
+            if profit_loss > 0:
+                self._perf_wins[i] += 1
             else:
-                metrics["losses"] += 1
+                self._perf_losses[i] += 1
             
-            metrics["profit_loss"] += signal["profit_loss"]
+            self._perf_pl[i] += profit_loss
             
             if "total_investment" in signal and signal["total_investment"] > 0:
-                metrics["return"] = (metrics["profit_loss"] / signal["total_investment"]) * 100
-        
-        self.performance[key] = metrics
+                self._perf_return[i] = (self._perf_pl[i] / signal["total_investment"]) * 100
         
         # Add to trade history
         self.trades.append({
-            "id": self.generate_trade_id(),
+            "id": trade_id or self.generate_trade_id(),
             "symbol": symbol,
             "action": action,
             "price": signal["price"],
             "quantity": signal["quantity"],
-            "timestamp": datetime.now().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "strategy": strategy_type
         })
     
@@ -790,8 +1310,53 @@ class StrategyManager:
         Returns:
             Performance metrics or None if not found
         """
-        key = f"{type_str}_{symbol}"
-        return self.performance.get(key)
+        i = self._perf_index.get((type_str, symbol))
+        if i is None:
+            return None
+        
+        return {
+            "trades": int(self._perf_trades[i]),
+            "wins": int(self._perf_wins[i]),
+            "losses": int(self._perf_losses[i]),
+            "profit_loss": float(self._perf_pl[i]),
+            "return": float(self._perf_return[i])
+        }
+    
+    def get_trades(self) -> List[Dict[str, Any]]:
+        """
+        Get a snapshot of the trade history
+        
+        Returns:
+            Trades, oldest first (a copy, safe to iterate while trades are being recorded)
+        """
+        # list() copies the deque in one C call under the GIL, so concurrent appends can't break it
+        return list(self.trades)
+    
+    def _perf_slot(self, key: Tuple[str, str]) -> int:
+        """
+        Get the performance array slot for a (type, symbol) key, allocating one if needed
+        
+        Args:
+            key: (strategy type, symbol)
+            
+        Returns:
+            Index into the performance arrays
+        """
+        i = self._perf_index.get(key)
+        if i is not None:
+            return i
+        
+        i = len(self._perf_index)
+        if i == self._perf_trades.shape[0]:
+            # Out of slots: double every array, keeping the existing metrics
+            for name in ("_perf_trades", "_perf_wins", "_perf_losses", "_perf_pl", "_perf_return"):
+                current = getattr(self, name)
+                grown = np.zeros(current.shape[0] * 2, dtype=current.dtype)
+                grown[:current.shape[0]] = current
+                setattr(self, name, grown)
+        
+        self._perf_index[key] = i
+        return i
     
     def update_risk_settings(self, settings: Dict[str, Any]):
         """
@@ -813,7 +1378,7 @@ class StrategyManager:
         Returns:
             Unique trade ID
         """
-        return f"trade_{uuid.uuid4().hex}"
+        return f"trade_{self._trade_session}_{next(self._trade_counter)}"
     
     async def backtest(self, type_str: str, parameters: Dict[str, Any], symbol: str, 
                     start_date: str, end_date: str, initial_capital: float) -> Dict[str, Any]:
@@ -835,256 +1400,279 @@ class StrategyManager:
             if type_str not in self.strategies:
                 raise ValueError(f"Strategy type {type_str} not found")
             
-            # Create strategy instance
-            strategy = self.strategies[type_str](f"Backtest {type_str}", parameters)
-            
-            # Apply risk management
-            strategy.set_risk_management(self.risk_settings)
-            
-            # Get historical data
-            # For simplicity, we'll use the CoinGecko API with a days parameter
-            # In a real system, you'd use a proper date range
-            start_timestamp = datetime.fromisoformat(start_date).timestamp()
-            end_timestamp = datetime.fromisoformat(end_date).timestamp()
-            days = int((end_timestamp - start_timestamp) / (24 * 60 * 60)) + 1
-            
-            historical_data = self.api_service.get_historical_data(symbol, str(days))
-            
-            if not historical_data or not historical_data.get("prices") or len(historical_data["prices"]) == 0:
-                raise ValueError("No historical data available")
-            
-            # Filter data by date range
-            start_datetime = datetime.fromisoformat(start_date)
-            end_datetime = datetime.fromisoformat(end_date)
-            
-            filtered_prices = [
-                item for item in historical_data["prices"]
-                if start_datetime <= datetime.fromisoformat(item["time"]) <= end_datetime
-            ]
-            
-            # Run backtest
-            capital = initial_capital
-            in_position = False
-            entry_price = 0
-            entry_quantity = 0
-            trades = []
-            
-            # Simulate trading
-            for i in range(50, len(filtered_prices)):  # Start at 50 to have enough data for indicators
-                current_price = filtered_prices[i]["value"]
-                current_time = filtered_prices[i]["time"]
-                
-                # Create a window of prices for technical analysis
-                price_window = [item["value"] for item in filtered_prices[i-50:i+1]]
-                
-                # Generate synthetic technical data
-                technicals = self.generate_technicals(price_window, current_price, symbol)
-                
-                # Get signal
-                signal = strategy.get_signal(current_price, technicals)
-                
-                if signal:
-                    if signal["action"] == "buy" and not in_position:
-                        # Calculate quantity based on position size
-                        position_size = capital * (self.risk_settings["max_position_size"] / 100)
-                        entry_quantity = position_size / current_price
-                        entry_price = current_price
-                        
-                        # Record trade
-                        trade_id = self.generate_trade_id()
-                        trades.append({
-                            "id": trade_id,
-                            "time": current_time,
-                            "action": "buy",
-                            "price": current_price,
-                            "quantity": entry_quantity,
-                            "value": position_size
-                        })
-                        
-                        # Update capital
-                        capital -= position_size
-                        in_position = True
-                    
-                    elif signal["action"] == "sell" and in_position:
-                        # Calculate exit value
-                        exit_value = entry_quantity * current_price
-                        profit_loss = exit_value - (entry_quantity * entry_price)
-                        
-                        # Record trade
-                        trade_id = self.generate_trade_id()
-                        trades.append({
-                            "id": trade_id,
-                            "time": current_time,
-                            "action": "sell",
-                            "price": current_price,
-                            "quantity": entry_quantity,
-                            "value": exit_value,
-                            "profit_loss": profit_loss
-                        })
-                        
-                        # Update capital
-                        capital += exit_value
-                        in_position = False
-                
-                # Apply stop loss if in position
-                if in_position and current_price <= entry_price * (1 - self.risk_settings["stop_loss"] / 100):
-                    # Stop loss triggered
-                    exit_value = entry_quantity * current_price
-                    profit_loss = exit_value - (entry_quantity * entry_price)
-                    
-                    # Record trade
-                    trade_id = self.generate_trade_id()
-                    trades.append({
-                        "id": trade_id,
-                        "time": current_time,
-                        "action": "sell",
-                        "price": current_price,
-                        "quantity": entry_quantity,
-                        "value": exit_value,
-                        "profit_loss": profit_loss,
-                        "stop_loss": True
-                    })
-                    
-                    # Update capital
-                    capital += exit_value
-                    in_position = False
-                
-                # Apply take profit if in position
-                if in_position and current_price >= entry_price * (1 + self.risk_settings["take_profit"] / 100):
-                    # Take profit triggered
-                    exit_value = entry_quantity * current_price
-                    profit_loss = exit_value - (entry_quantity * entry_price)
-                    
-                    # Record trade
-                    trade_id = self.generate_trade_id()
-                    trades.append({
-                        "id": trade_id,
-                        "time": current_time,
-                        "action": "sell",
-                        "price": current_price,
-                        "quantity": entry_quantity,
-                        "value": exit_value,
-                        "profit_loss": profit_loss,
-                        "take_profit": True
-                    })
-                    
-                    # Update capital
-                    capital += exit_value
-                    in_position = False
-            
-            # Close any open position at the end
-            if in_position:
-                last_price = filtered_prices[-1]["value"]
-                exit_value = entry_quantity * last_price
-                profit_loss = exit_value - (entry_quantity * entry_price)
-                
-                # Record trade
-                trade_id = self.generate_trade_id()
-                trades.append({
-                    "id": trade_id,
-                    "time": filtered_prices[-1]["time"],
-                    "action": "sell",
-                    "price": last_price,
-                    "quantity": entry_quantity,
-                    "value": exit_value,
-                    "profit_loss": profit_loss
-                })
-                
-                # Update capital
-                capital += exit_value
-            
-            # Calculate performance metrics
-            final_capital = capital
-            total_return = ((final_capital - initial_capital) / initial_capital) * 100
-            
-            # Count wins and losses
-            wins = 0
-            losses = 0
-            total_profit = 0
-            total_loss = 0
+            points, prices, indicators = self._backtest_data(symbol, start_date, end_date)
             
-            buy_trades = [t for t in trades if t["action"] == "buy"]
-            sell_trades = [t for t in trades if t["action"] == "sell"]
+            simulation = _run_backtest(
+                self.strategies[type_str], type_str, parameters, self.risk_settings,
+                symbol, prices, indicators, initial_capital
+            )
             
-            for i in range(min(len(buy_trades), len(sell_trades))):
-                if "profit_loss" in sell_trades[i]:
-                    profit_loss = sell_trades[i]["profit_loss"]
-                    
-                    if profit_loss > 0:
-                        wins += 1
-                        total_profit += profit_loss
-                    else:
-                        losses += 1
-                        total_loss += abs(profit_loss)
+            return self._backtest_result(type_str, parameters, start_date, end_date, initial_capital, points, simulation)
+        
+        except Exception as e:
+            self.logger.error("Backtest failed: %s", e)
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    async def backtest_sweep(self, type_str: str, parameter_sets: List[Dict[str, Any]], symbol: str,
+                             start_date: str, end_date: str, initial_capital: float) -> Dict[str, Any]:
+        """
+        Backtest several parameter sets of a strategy on the same historical data, in parallel processes
+        
+        The price and indicator series are prepared once; the parameter sets are split into one
+        contiguous slice per worker, so the series are sent to each worker once per sweep.
+        
+        Args:
+            type_str: Strategy type
+            parameter_sets: Strategy parameters to backtest, one backtest each
+            symbol: Cryptocurrency symbol
+            start_date: Start date (ISO format)
+            end_date: End date (ISO format)
+            initial_capital: Initial capital
             
-            total_trades = wins + losses
-            win_rate = (wins / total_trades) * 100 if total_trades > 0 else 0
-            profit_factor = total_profit / total_loss if total_loss > 0 else (total_profit > 0 and 100 or 0)
+        Returns:
+            Backtest results in the order of parameter_sets
+        """
+        try:
+            if type_str not in self.strategies:
+                raise ValueError(f"Strategy type {type_str} not found")
             
-            # Calculate drawdown
-            max_drawdown = 0
-            peak = initial_capital
-            trough = initial_capital
+            points, prices, indicators = self._backtest_data(symbol, start_date, end_date)
             
-            cumulative_capital = initial_capital
-            equity_curve = [{"time": start_date, "value": initial_capital}]
+            strategy_class = self.strategies[type_str]
+            risk_settings = dict(self.risk_settings)
+            workers = min(len(parameter_sets), self.SWEEP_WORKERS)
             
-            for trade in trades:
-                if trade["action"] == "buy":
-                    cumulative_capital -= trade["value"]
-                else:
-                    cumulative_capital += trade["value"]
-                
-                equity_curve.append({
-                    "time": trade["time"],
-                    "value": cumulative_capital
-                })
-                
-                # Update peak and trough
-                if cumulative_capital > peak:
-                    peak = cumulative_capital
-                    trough = peak  # Reset trough when a new peak is reached
-                elif cumulative_capital < trough:
-                    trough = cumulative_capital
-                    
-                    # Calculate drawdown
-                    drawdown = ((peak - trough) / peak) * 100
-                    if drawdown > max_drawdown:
-                        max_drawdown = drawdown
+            if workers > 1:
+                size = -(-len(parameter_sets) // workers)
+                chunks = [parameter_sets[i:i + size] for i in range(0, len(parameter_sets), size)]
+                simulations = list(itertools.chain.from_iterable(self._get_sweep_pool().map(
+                    _sweep_chunk,
+                    [strategy_class] * len(chunks),
+                    [type_str] * len(chunks),
+                    chunks,
+                    [risk_settings] * len(chunks),
+                    [symbol] * len(chunks),
+                    [prices] * len(chunks),
+                    [indicators] * len(chunks),
+                    [initial_capital] * len(chunks)
+                )))
+            else:
+                simulations = [
+                    _run_backtest(strategy_class, type_str, parameters, risk_settings, symbol, prices, indicators, initial_capital)
+                    for parameters in parameter_sets
+                ]
             
-            # Return backtest results
             return {
-                "strategy": {
-                    "type": type_str,
-                    "parameters": parameters
-                },
-                "period": {
-                    "start": start_date,
-                    "end": end_date
-                },
-                "initial_capital": initial_capital,
-                "final_capital": final_capital,
-                "total_return": total_return,
-                "trades": trades,
-                "metrics": {
-                    "trades": total_trades,
-                    "wins": wins,
-                    "losses": losses,
-                    "win_rate": win_rate,
-                    "profit_factor": profit_factor,
-                    "max_drawdown": max_drawdown
-                },
-                "equity_curve": equity_curve
+                "results": [
+                    self._backtest_result(type_str, parameters, start_date, end_date, initial_capital, points, simulation)
+                    for parameters, simulation in zip(parameter_sets, simulations)
+                ]
             }
         
         except Exception as e:
-            self.logger.error(f"Backtest failed: {str(e)}")
+            self.logger.error("Backtest sweep failed: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
     
-    def generate_technicals(self, prices: List[float], current_price: float, symbol: str) -> Dict[str, Any]:
+    def _get_sweep_pool(self) -> ProcessPoolExecutor:
+        """
+        Get the process pool for backtest sweeps, creating it on first use
+        
+        Workers are started with forkserver (spawn where it isn't available) rather than fork,
+        so they don't inherit the locks and threads of the running server.
+        
+        Returns:
+            Process pool shared by all sweeps
+        """
+        with self._sweep_pool_lock:
+            if self._sweep_pool is None:
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._sweep_pool = ProcessPoolExecutor(
+                    max_workers=self.SWEEP_WORKERS, mp_context=multiprocessing.get_context(method)
+                )
+            return self._sweep_pool
+    
+    def _backtest_data(self, symbol: str, start_date: str, end_date: str):
+        """
+        Fetch and prepare the historical data for a backtest
+        
+        Args:
+            symbol: Cryptocurrency symbol
+            start_date: Start date (ISO format)
+            end_date: End date (ISO format)
+            
+        Returns:
+            Tuple of (price points, price array, indicator series) for the simulated bars
+        """
+        # Get historical data
+        # For simplicity, we'll use the CoinGecko API with a days parameter
+        # In a real system, you'd use a proper date range
+        start_datetime = _naive_utc(start_date)
+        end_datetime = _naive_utc(end_date)
+        days = int((end_datetime.timestamp() - start_datetime.timestamp()) / (24 * 60 * 60)) + 1
+        
+        historical_data = self.api_service.get_historical_data(symbol, str(days))
+        
+        if not historical_data or not historical_data.get("prices") or len(historical_data["prices"]) == 0:
+            raise ValueError("No historical data available")
+        
+        # Filter data by date range: parse the (sorted) UTC timestamps in one vectorized call and binary search the bounds
+        # (the 'Z' is dropped first, NumPy's parsing of timezone-aware strings is deprecated)
+        points = historical_data["prices"]
+        times = np.array([item["time"].removesuffix("Z") for item in points], dtype="datetime64[us]")
+        first = np.searchsorted(times, np.datetime64(start_datetime, "us"), side="left")
+        last = np.searchsorted(times, np.datetime64(end_datetime, "us"), side="right")
+        filtered_prices = points[first:last]
+        
+        # Indicator series over the whole range, then simulate from bar 50 on to have enough data for indicators
+        prices = np.fromiter((item["value"] for item in filtered_prices), dtype=np.float64, count=len(filtered_prices))
+        indicators = {name: series[50:] for name, series in self.backtest_indicators(prices).items()}
+        
+        return filtered_prices[50:], prices[50:], indicators
+    
+    def _backtest_result(self, type_str: str, parameters: Dict[str, Any], start_date: str, end_date: str,
+                         initial_capital: float, points: List[Dict[str, Any]], simulation: tuple) -> Dict[str, Any]:
+        """
+        Build the backtest response from the simulated trade arrays
+        
+        Args:
+            type_str: Strategy type
+            parameters: Strategy parameters
+            start_date: Start date (ISO format)
+            end_date: End date (ISO format)
+            initial_capital: Initial capital
+            points: Price points of the simulated bars
+            simulation: Per-trade arrays and final capital from _simulate_backtest
+            
+        Returns:
+            Backtest results
+        """
+        trade_bars, sides, quantities, values, profit_losses, exits, capital = simulation
+        
+        # Win/loss accounting straight from the trade arrays (each sell closes a position)
+        sell_profit_losses = profit_losses[sides < 0]
+        won = sell_profit_losses > 0
+        wins = int(np.count_nonzero(won))
+        losses = int(sell_profit_losses.size - wins)
+        total_profit = float(sell_profit_losses[won].sum())
+        total_loss = float(-sell_profit_losses[~won].sum())
+        
+        # Cash after each trade (buys take the position value out, sells put the exit value back)
+        equity = np.cumsum(np.concatenate(([float(initial_capital)], np.where(sides > 0, -values, values))))
+        max_drawdown = calculate_drawdown(equity)[0]
+        
+        # Equity curve as parallel time/value columns: the start point, then one point per trade
+        equity_times = [start_date]
+        equity_times.extend(points[bar]["time"] for bar in trade_bars.tolist())
+        
+        # Materialize trade records and equity points for the response only
+        trades = []
+        for bar, side, quantity, value, profit_loss, exit_flag in zip(
+            trade_bars.tolist(), sides.tolist(), quantities.tolist(),
+            values.tolist(), profit_losses.tolist(), exits.tolist()
+        ):
+            item = points[bar]
+            trade = {
+                "id": self.generate_trade_id(),
+                "time": item["time"],
+                "action": BUY if side > 0 else SELL,
+                "price": item["value"],
+                "quantity": quantity,
+                "value": value
+            }
+            if side < 0:
+                trade["profit_loss"] = profit_loss
+            if exit_flag == 1:
+                trade["stop_loss"] = True
+            elif exit_flag == 2:
+                trade["take_profit"] = True
+            trades.append(trade)
+        
+        equity_curve = [{"time": t, "value": v} for t, v in zip(equity_times, equity.tolist())]
+        
+        # Calculate performance metrics
+        final_capital = capital
+        total_return = ((final_capital - initial_capital) / initial_capital) * 100
+        
+        total_trades = wins + losses
+        win_rate = (wins / total_trades) * 100 if total_trades > 0 else 0
+        profit_factor = total_profit / total_loss if total_loss > 0 else (total_profit > 0 and 100 or 0)
+        
+        # Return backtest results
+        return {
+            "strategy": {
+                "type": type_str,
+                "parameters": parameters
+            },
+            "period": {
+                "start": start_date,
+                "end": end_date
+            },
+            "initial_capital": initial_capital,
+            "final_capital": final_capital,
+            "total_return": total_return,
+            "trades": trades,
+            "metrics": {
+                "trades": total_trades,
+                "wins": wins,
+                "losses": losses,
+                "win_rate": win_rate,
+                "profit_factor": profit_factor,
+                "max_drawdown": max_drawdown
+            },
+            "equity_curve": equity_curve
+        }
+    
+    def backtest_indicators(self, prices: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Calculate the backtest indicators at every bar in one pass each
+        
+        Results are cached by the content of the price series, so repeated backtests over the
+        same data (parameter sweeps, re-runs) skip the computation.
+        
+        Args:
+            prices: Contiguous float64 array of prices
+            
+        Returns:
+            Indicator series aligned with prices (shared with the cache, don't modify)
+        """
+        key = hashlib.blake2b(prices.tobytes(), digest_size=16).digest()
+        with self._indicator_lock:
+            cached = self._indicator_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        ema_fast = _ema_series(prices, 12)
+        ema_slow = _ema_series(prices, 26)
+        bb_upper, bb_middle, bb_lower = _bollinger_vec(prices, 20, 2.0)
+        
+        macd = ema_fast - ema_slow
+        macd_signal = _ema_series(macd, 9)
+        
+        indicators = {
+            "ema_short": _ema_series(prices, 9),
+            "ema_medium": _ema_series(prices, 21),
+            "ema_long": _ema_series(prices, 50),
+            "rsi": _rsi_series(prices, 14),
+            "macd": macd,
+            "macd_signal": macd_signal,
+            "macd_histogram": macd - macd_signal,
+            "bb_upper": bb_upper,
+            "bb_middle": bb_middle,
+            "bb_lower": bb_lower
+        }
+        
+        with self._indicator_lock:
+            self._indicator_cache[key] = indicators
+        
+        return indicators
+    
+    def generate_technicals(self, prices: Union[List[float], np.ndarray], current_price: float, symbol: str) -> Dict[str, Any]:
         """
         Generate synthetic technical indicators for backtesting
         
@@ -1096,8 +1684,8 @@ class StrategyManager:
         Returns:
             Technical indicators
         """
-        # Use numpy for calculations
-        prices_array = np.array(prices)
+        # Use numpy for calculations (arrays and views are used as-is)
+        prices_array = np.asarray(prices, dtype=np.float64)
         
         # Calculate EMAs
         short_ema = self.calculate_ema(prices_array, 9)
@@ -1125,69 +1713,25 @@ class StrategyManager:
             "macd": macd,
             "bollinger": bollinger,
             "signal": "neutral",  # Will be determined by the strategy
-            "timestamp": datetime.now().isoformat()
+            "timestamp_ns": time.time_ns()
         }
     
     def calculate_ema(self, prices: np.ndarray, period: int) -> float:
         """Calculate EMA for backtesting"""
-        if len(prices) < period:
-            return prices[-1]
-        
-        # Calculate simple moving average (SMA) for the initial value
-        sma = np.mean(prices[:period])
-        
-        # Calculate the multiplier
-        multiplier = 2 / (period + 1)
-        
-        # Calculate EMA
-        ema = sma
-        for i in range(period, len(prices)):
-            ema = (prices[i] - ema) * multiplier + ema
-        
-        return float(ema)
+        return float(_ema_series(prices, period)[-1])
     
     def calculate_rsi(self, prices: np.ndarray, period: int) -> float:
         """Calculate RSI for backtesting"""
-        if len(prices) <= period:
-            return 50
-        
-        # Calculate price changes
-        deltas = np.diff(prices)
-        
-        # Calculate gains and losses
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        # Calculate average gain and loss
-        avg_gain = np.mean(gains[:period])
-        avg_loss = np.mean(losses[:period])
-        
-        # Calculate RS values for the remaining periods
-        for i in range(period, len(deltas)):
-            avg_gain = ((avg_gain * (period - 1)) + gains[i]) / period
-            avg_loss = ((avg_loss * (period - 1)) + losses[i]) / period
-        
-        # Calculate RSI
-        if avg_loss == 0:
-            return 100
-        
-        rs = avg_gain / avg_loss
-        return 100 - (100 / (1 + rs))
+        return float(_rsi_series(prices, period)[-1])
     
     def calculate_macd(self, prices: np.ndarray, fast_period: int, slow_period: int, signal_period: int) -> Dict[str, float]:
         """Calculate MACD for backtesting"""
-        # Calculate fast and slow EMAs
-        fast_ema = self.calculate_ema(prices, fast_period)
-        slow_ema = self.calculate_ema(prices, slow_period)
-        
-        # Calculate MACD line
-        macd_line = fast_ema - slow_ema
-        
-        # Generate simple MACD history
-        macd_history = np.full(signal_period, macd_line)
+        prices = np.ascontiguousarray(prices, dtype=np.float64)
         
-        # Calculate signal line
-        signal_line = np.mean(macd_history)
+        # MACD line at every bar, then the signal line as its EMA
+        macd_series = _ema_series(prices, fast_period) - _ema_series(prices, slow_period)
+        macd_line = macd_series[-1]
+        signal_line = _ema_series(macd_series, signal_period)[-1]
         
         return {
             "value": float(macd_line),
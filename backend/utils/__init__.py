@@ -7,21 +7,33 @@ from .helpers import (
     setup_logger,
     utc_now,
     iso_to_datetime,
+    ns_to_iso,
+    with_iso_timestamp,
     calculate_returns,
     calculate_sharpe_ratio,
     calculate_drawdown,
     group_by_interval,
     safe_request
 )
+from .json_provider import OrjsonProvider, orjson_response
+from .cache import StaleTTLCache
+from .jit import njit, NUMBA_AVAILABLE
 
 # Export utility functions
 __all__ = [
     'setup_logger',
     'utc_now',
     'iso_to_datetime',
+    'ns_to_iso',
+    'with_iso_timestamp',
     'calculate_returns',
     'calculate_sharpe_ratio',
     'calculate_drawdown',
     'group_by_interval',
-    'safe_request'
+    'safe_request',
+    'OrjsonProvider',
+    'orjson_response',
+    'StaleTTLCache',
+    'njit',
+    'NUMBA_AVAILABLE'
 ]
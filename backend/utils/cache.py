@@ -0,0 +1,62 @@
+"""
+Caching helpers for Crypto Trading Bot
+Thread-safe TTL cache that keeps the last value per key as a fallback after it expires
+"""
+import threading
+from typing import Any, Hashable
+from cachetools import LRUCache, TTLCache
+
+class StaleTTLCache:
+    """Bounded TTL cache with a stale fallback, safe to share between threads"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Maximum number of keys kept (fresh and stale each)
+            ttl: Seconds a value stays fresh
+        """
+        # Expired entries are evicted from the fresh cache automatically
+        self._fresh = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Last known value per key, served (even if expired) when a refresh fails
+        self._stale = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Get a fresh cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._lock:
+            return self._fresh.get(key)
+
+    def get_stale(self, key: Hashable) -> Any:
+        """
+        Get the last cached value, even if it has expired
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if never cached
+        """
+        with self._lock:
+            return self._stale.get(key)
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Store a value in the cache and as the stale fallback
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._fresh[key] = value
+            self._stale[key] = value
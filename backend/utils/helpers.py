@@ -6,11 +6,35 @@ import numpy as np
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional, Union
 
+# ciso8601's C parser is much faster than datetime.fromisoformat; fall back to the standard library without it
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    def _parse_iso(iso_str: str) -> datetime:
+        """datetime.fromisoformat, also accepting a trailing 'Z' for UTC"""
+        if iso_str.endswith('Z'):
+            iso_str = iso_str[:-1] + '+00:00'
+        return datetime.fromisoformat(iso_str)
+
 # Configure logging
+_LOG_LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL
+}
+
+# Shared by every handler setup_logger creates
+_LOG_FORMATTER = logging.Formatter('{asctime} - {name} - {levelname} - {message}', style='{')
+
 def setup_logger(name: str, level: str = 'INFO') -> logging.Logger:
     """
     Set up a logger with the specified name and level
     
+    Calling it again for the same logger only updates the level (of the logger and of the handler
+    created here), it doesn't add another handler.
+    
     Args:
         name: Logger name
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -21,25 +45,20 @@ def setup_logger(name: str, level: str = 'INFO') -> logging.Logger:
     logger = logging.getLogger(name)
     
     # Convert level string to logging level
-    level_map = {
-        'DEBUG': logging.DEBUG,
-        'INFO': logging.INFO,
-        'WARNING': logging.WARNING,
-        'ERROR': logging.ERROR,
-        'CRITICAL': logging.CRITICAL
-    }
-    log_level = level_map.get(level.upper(), logging.INFO)
+    log_level = _LOG_LEVELS.get(level.upper(), logging.INFO)
     logger.setLevel(log_level)
     
+    if logger.handlers:
+        # Handlers created here are recognised by the shared formatter; others are left alone
+        for handler in logger.handlers:
+            if handler.formatter is _LOG_FORMATTER:
+                handler.setLevel(log_level)
+        return logger
+    
     # Create console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(log_level)
-    
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    console_handler.setFormatter(formatter)
+    console_handler.setFormatter(_LOG_FORMATTER)
     
     # Add handler to logger
     logger.addHandler(console_handler)
@@ -66,40 +85,69 @@ def iso_to_datetime(iso_str: str) -> datetime:
     Returns:
         Datetime object
     """
-    return datetime.fromisoformat(iso_str.replace('Z', '+00:00'))
+    return _parse_iso(iso_str)
+
+def ns_to_iso(timestamp_ns: int) -> str:
+    """
+    Convert a nanosecond epoch timestamp to an ISO 8601 string
+    
+    Args:
+        timestamp_ns: Timestamp from time.time_ns()
+        
+    Returns:
+        ISO 8601 string (UTC)
+    """
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc).isoformat()
+
+def with_iso_timestamp(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Render a record's "timestamp_ns" field as an ISO 8601 "timestamp" for API output
+    
+    Args:
+        record: Record such as a signal or trade
+        
+    Returns:
+        Copy of the record with "timestamp" in place of "timestamp_ns" (the record itself if it has none)
+    """
+    if "timestamp_ns" not in record:
+        return record
+    
+    record = dict(record)
+    record["timestamp"] = ns_to_iso(record.pop("timestamp_ns"))
+    return record
 
 # Financial calculation utilities
-def calculate_returns(prices: List[float]) -> List[float]:
+def calculate_returns(prices: Union[List[float], np.ndarray]) -> np.ndarray:
     """
     Calculate percentage returns from a series of prices
     
     Args:
-        prices: List of prices
+        prices: Prices (list or array)
         
     Returns:
-        List of percentage returns
+        Array of percentage returns (empty for fewer than two prices)
     """
-    if len(prices) < 2:
-        return []
+    prices = np.asarray(prices, dtype=np.float64)
+    if prices.size < 2:
+        return np.empty(0)
     
-    return [(prices[i] - prices[i-1]) / prices[i-1] * 100 for i in range(1, len(prices))]
+    return np.diff(prices) / prices[:-1] * 100.0
 
-def calculate_sharpe_ratio(returns: List[float], risk_free_rate: float = 0.0) -> float:
+def calculate_sharpe_ratio(returns: Union[List[float], np.ndarray], risk_free_rate: float = 0.0) -> float:
     """
     Calculate the Sharpe ratio
     
     Args:
-        returns: List of percentage returns
+        returns: Percentage returns (list or array)
         risk_free_rate: Risk-free rate (annualized)
         
     Returns:
         Sharpe ratio
     """
-    if not returns:
-        return 0.0
-    
     # Convert to numpy array
-    returns_array = np.array(returns)
+    returns_array = np.asarray(returns, dtype=np.float64)
+    if not returns_array.size:
+        return 0.0
     
     # Calculate statistics
     mean_return = np.mean(returns_array)
@@ -113,39 +161,36 @@ def calculate_sharpe_ratio(returns: List[float], risk_free_rate: float = 0.0) ->
     
     return float(sharpe)
 
-def calculate_drawdown(equity_curve: List[float]) -> tuple:
+def calculate_drawdown(equity_curve: Union[List[float], np.ndarray]) -> tuple:
     """
     Calculate maximum drawdown
     
     Args:
-        equity_curve: List of equity values over time
+        equity_curve: Equity values over time (list or array)
         
     Returns:
         Tuple of (maximum drawdown percentage, peak, trough)
     """
-    if not equity_curve:
+    equity = np.asarray(equity_curve, dtype=np.float64)
+    if not equity.size:
         return 0.0, 0.0, 0.0
     
-    max_drawdown = 0.0
-    peak = equity_curve[0]
-    trough = equity_curve[0]
-    current_peak = equity_curve[0]
-    
-    for value in equity_curve:
-        if value > current_peak:
-            current_peak = value
-        
-        # Calculate drawdown
-        drawdown = (current_peak - value) / current_peak * 100
-        
-        if drawdown > max_drawdown:
-            max_drawdown = drawdown
-            peak = current_peak
-            trough = value
+    # Running peak and the drawdown from it at every point
+    peaks = np.maximum.accumulate(equity)
+    drawdowns = (peaks - equity) / peaks * 100.0
     
-    return max_drawdown, peak, trough
+    i = int(drawdowns.argmax())
+    return float(drawdowns[i]), float(peaks[i]), float(equity[i])
 
 # Data transformation utilities
+
+# datetime64 unit each interval truncates to, and the suffix completing its key
+_INTERVAL_UNITS = {
+    'day': ('datetime64[D]', ''),
+    'hour': ('datetime64[h]', ':00'),
+    'minute': ('datetime64[m]', '')
+}
+
 def group_by_interval(data: List[Dict[str, Any]], time_key: str, interval: str = 'day') -> Dict[str, List[Dict[str, Any]]]:
     """
     Group data by time interval
@@ -158,27 +203,25 @@ def group_by_interval(data: List[Dict[str, Any]], time_key: str, interval: str =
     Returns:
         Dictionary with intervals as keys and lists of data as values
     """
-    result = {}
+    if not data:
+        return {}
     
-    for item in data:
-        # Convert time to datetime
-        dt = iso_to_datetime(item[time_key])
-        
-        # Generate interval key
-        if interval == 'day':
-            key = dt.strftime('%Y-%m-%d')
-        elif interval == 'hour':
-            key = dt.strftime('%Y-%m-%d %H:00')
-        elif interval == 'minute':
-            key = dt.strftime('%Y-%m-%d %H:%M')
-        else:
-            key = dt.strftime('%Y-%m-%d')
-        
-        # Add item to result
-        if key not in result:
-            result[key] = []
-        
-        result[key].append(item)
+    unit, suffix = _INTERVAL_UNITS.get(interval, _INTERVAL_UNITS['day'])
+    times = [item[time_key] for item in data]
+    
+    # Bucket on wall-clock time: UTC offsets are dropped explicitly rather than left to NumPy's
+    # (deprecated) parsing of timezone-aware strings, which would shift them to UTC
+    stamps = np.array([iso_to_datetime(t).replace(tzinfo=None) for t in times], dtype='datetime64[us]')
+    
+    # Truncate to the interval and number the distinct buckets
+    buckets, first_index, inverse = np.unique(stamps.astype(unit), return_index=True, return_inverse=True)
+    keys = [key.replace('T', ' ') + suffix for key in np.datetime_as_string(buckets).tolist()]
+    
+    # Keys in order of first appearance, items in their original order
+    result = {keys[i]: [] for i in np.argsort(first_index, kind='stable').tolist()}
+    groups = [result[key] for key in keys]
+    for item, bucket in zip(data, inverse.tolist()):
+        groups[bucket].append(item)
     
     return result
 
@@ -192,7 +235,7 @@ def safe_request(func):
             return func(*args, **kwargs)
         except Exception as e:
             logger = logging.getLogger("api")
-            logger.error(f"API request failed: {str(e)}")
+            logger.error("API request failed: %s", e)
             return None
     
     return wrapper
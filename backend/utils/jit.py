@@ -0,0 +1,23 @@
+"""
+JIT compilation helpers for Crypto Trading Bot
+Compiles numeric kernels with Numba when it is installed, otherwise runs them as plain Python
+"""
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """
+        No-op stand-in for numba.njit
+        
+        Supports both the bare @njit form and @njit(...) with options.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        
+        def decorator(func):
+            return func
+        
+        return decorator
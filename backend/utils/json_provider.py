@@ -0,0 +1,68 @@
+"""
+JSON provider for Crypto Trading Bot
+Serializes Flask JSON responses with orjson
+"""
+import hashlib
+import orjson
+from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (also handles NumPy values natively)"""
+    
+    # Base orjson options for every dump
+    option = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    
+    def _dumps_bytes(self, obj, indent=None):
+        """
+        Serialize an object to JSON bytes
+        
+        Args:
+            obj: Object to serialize
+            indent: Pretty-print when set (orjson only supports 2 spaces)
+            
+        Returns:
+            JSON encoded bytes
+        """
+        option = self.option
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        
+        return orjson.dumps(obj, default=self.default, option=option)
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize an object to a JSON string"""
+        return self._dumps_bytes(obj, kwargs.get("indent")).decode()
+    
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes"""
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        """Build a JSON response directly from orjson bytes"""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = 2 if self.compact is None and self._app.debug else None
+        
+        return self._app.response_class(self._dumps_bytes(obj, indent), mimetype=self.mimetype)
+
+def orjson_response(data, status=200, etag=False):
+    """
+    Build a JSON response straight from orjson, bypassing the provider indirection
+    
+    Args:
+        data: JSON-serializable data
+        status: HTTP status code
+        etag: Add a weak ETag and answer a matching If-None-Match with 304
+        
+    Returns:
+        Flask response
+    """
+    body = orjson.dumps(data, option=OrjsonProvider.option)
+    response = current_app.response_class(body, status=status, mimetype="application/json")
+    
+    if etag:
+        # BLAKE2b is cheaper than SHA-256 and 8 bytes is plenty for a cache validator
+        response.set_etag(hashlib.blake2b(body, digest_size=8).hexdigest(), weak=True)
+        response.make_conditional(request)
+    
+    return response